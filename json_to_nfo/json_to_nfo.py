@@ -2,77 +2,126 @@ import os
 import json
 import yaml
 import argparse
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
 from datetime import datetime
 
-# 커맨드라인 인자 처리
-parser = argparse.ArgumentParser(description="Batch JSON to NFO Converter")
-parser.add_argument("--json-folder", default="/where/your/info.json", help="info.json 파일이 있는 폴더")
-parser.add_argument("--yaml", default="/where/your/yaml/tubesync.yaml", help="사용할 YAML 템플릿 파일")
-args = parser.parse_args()
+# orjson이 있으면 사용 (없으면 표준 json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-JSON_FOLDER = args.json_folder
-YAML_FILE = args.yaml
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-# YAML 템플릿 불러오기
-with open(YAML_FILE, "r", encoding="utf-8") as f:
-    template = yaml.safe_load(f)
+FIELDS = ("title", "showtitle", "season", "episode", "plot", "runtime", "id", "studio", "genre")
+
+# YAML 템플릿 (메인에서 한 번 읽고 워커 initializer로 전달)
+template = None
+ACTIVE_FIELDS = ()   # (태그, info.json 키) — 템플릿에 있는 필드만, 워커마다 한 번 계산
+RATINGS_INFO = []
+DATE_ADDED = ""      # 배치 시작 시각 (파일마다 datetime 생성하지 않음)
+
+def init_worker(tmpl, date_added):
+    global template, ACTIVE_FIELDS, RATINGS_INFO, DATE_ADDED
+    template = tmpl
+    DATE_ADDED = date_added
+    ACTIVE_FIELDS = tuple((f, "description" if f == "plot" else f) for f in FIELDS if f in template)
+    RATINGS_INFO = template.get("ratings", [])
 
 def get_value(info, key, default=""):
     return info.get(key, default)
 
+THUMB_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+
+# 폴더별 파일명 집합 (폴더당 scandir 한 번, 파일마다 stat 하지 않음)
+dir_index = {}
+
+def dir_file_names(folder):
+    names = dir_index.get(folder)
+    if names is None:
+        try:
+            with os.scandir(folder or ".") as it:
+                names = {entry.name for entry in it}
+        except FileNotFoundError:
+            names = set()
+        dir_index[folder] = names
+    return names
+
 def find_thumbnail(info_path, info):
     base_name = os.path.splitext(info_path)[0]
     if base_name.endswith(".info"):
         base_name = base_name[:-5]
 
-    for ext in [".jpg", ".jpeg", ".png", ".webp"]:
-        candidate = base_name + ext
-        if os.path.exists(candidate):
-            return os.path.basename(candidate)
+    folder, name = os.path.split(base_name)
+    names = dir_file_names(folder)
+    for ext in THUMB_EXTS:
+        candidate = name + ext
+        if candidate in names:
+            return candidate
     return get_value(info, "thumbnail", "")
 
+# NFO 스키마가 고정이므로 ElementTree 없이 미리 만든 템플릿 문자열로 바로 출력
+XML_HEADER = "<?xml version='1.0' encoding='utf-8'?>\n<episodedetails>\n"
+XML_FOOTER = "</episodedetails>"
+RATING_TEMPLATE = (
+    '  <ratings>\n'
+    '    <rating name="{name}" max="{max}" default="{default}">\n'
+    '      {value}\n'
+    '      {votes}\n'
+    '    </rating>\n'
+    '  </ratings>\n'
+)
+UNIQUEID_TEMPLATE = (
+    '  <uniqueid type="youtube" default="True">\n'
+    '    {value}\n'
+    '  </uniqueid>\n'
+)
+ATTR_ENTITIES = {'"': "&quot;", "\r": "&#13;", "\n": "&#10;", "\t": "&#09;"}
+
+def text_element(tag, text):
+    # ElementTree와 동일하게 빈 값은 <tag /> 로 출력
+    text = "" if text is None else str(text)
+    if not text:
+        return f"<{tag} />"
+    return f"<{tag}>{escape(text)}</{tag}>"
+
 def json_to_nfo(info_path):
-    with open(info_path, "r", encoding="utf-8") as f:
-        info = json.load(f)
+    with open(info_path, "rb") as f:
+        info = json_loads(f.read())
 
-    root = Element("episodedetails")
+    parts = [XML_HEADER]
 
     # 필드 처리
-    for field in ["title", "showtitle", "season", "episode", "plot", "runtime", "id", "studio", "genre"]:
-        if field in template:
-            text = get_value(info, field) if field != "plot" else get_value(info, "description", "")
-            SubElement(root, field).text = str(text)
+    for field, key in ACTIVE_FIELDS:
+        parts.append(f"  {text_element(field, get_value(info, key))}\n")
 
     # 섬네일 처리
-    thumb_tag = SubElement(root, "thumb")
-    thumb_tag.text = find_thumbnail(info_path, info)
+    parts.append(f"  {text_element('thumb', find_thumbnail(info_path, info))}\n")
 
     # ratings
-    ratings_info = template.get("ratings", [])
-    for r in ratings_info:
-        rating = SubElement(root, "ratings")
-        sub = SubElement(rating, "rating", {
-            "name": r.get("name", "youtube"),
-            "max": str(r.get("max", 5)),
-            "default": str(r.get("default", True)).lower()
-        })
-        SubElement(sub, "value").text = str(info.get("average_rating", r.get("value", 0)))
-        SubElement(sub, "votes").text = str(info.get("view_count", r.get("votes", 0)))
+    for r in RATINGS_INFO:
+        parts.append(RATING_TEMPLATE.format(
+            name=escape(str(r.get("name", "youtube")), ATTR_ENTITIES),
+            max=escape(str(r.get("max", 5)), ATTR_ENTITIES),
+            default=escape(str(r.get("default", True)).lower(), ATTR_ENTITIES),
+            value=text_element("value", info.get("average_rating", r.get("value", 0))),
+            votes=text_element("votes", info.get("view_count", r.get("votes", 0))),
+        ))
 
     # uniqueid
-    uid = SubElement(root, "uniqueid", {"type": "youtube", "default": "True"})
-    SubElement(uid, "value").text = info.get("id", "")
+    parts.append(UNIQUEID_TEMPLATE.format(value=text_element("value", info.get("id", ""))))
 
     # aired, dateadded
+    # upload_date는 YYYYMMDD 형식 → 슬라이싱으로 YYYY-MM-DD
     upload_date = info.get("upload_date")
-    if upload_date:
-        SubElement(root, "aired").text = datetime.strptime(upload_date, "%Y%m%d").strftime("%Y-%m-%d")
-    SubElement(root, "dateadded").text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    # UTF-8 인코딩 포함
-    xml_bytes = minidom.parseString(tostring(root)).toprettyxml(indent="  ", encoding="utf-8")
+    if upload_date and len(upload_date) == 8 and upload_date.isdigit():
+        parts.append(f"  {text_element('aired', f'{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:8]}')}\n")
+    parts.append(f"  {text_element('dateadded', DATE_ADDED)}\n")
+    parts.append(XML_FOOTER)
 
     # NFO 파일명 생성 (.info 제거)
     base_name = os.path.splitext(info_path)[0]
@@ -80,13 +129,28 @@ def json_to_nfo(info_path):
         base_name = base_name[:-5]
     nfo_filename = base_name + ".nfo"
 
+    # UTF-8 인코딩 포함, 한 번에 기록
     with open(nfo_filename, "wb") as f:
-        f.write(xml_bytes)
+        f.write("".join(parts).encode("utf-8"))
 
     print(f"NFO 생성 완료: {nfo_filename}")
 
-# 폴더 내 모든 info.json 처리
-for file in os.listdir(JSON_FOLDER):
-    if file.endswith(".json"):
-        json_path = os.path.join(JSON_FOLDER, file)
-        json_to_nfo(json_path)
+def main():
+    # 커맨드라인 인자 처리
+    parser = argparse.ArgumentParser(description="Batch JSON to NFO Converter")
+    parser.add_argument("--json-folder", default="/where/your/info.json", help="info.json 파일이 있는 폴더")
+    parser.add_argument("--yaml", default="/where/your/yaml/tubesync.yaml", help="사용할 YAML 템플릿 파일")
+    args = parser.parse_args()
+
+    # YAML 템플릿 불러오기
+    with open(args.yaml, "r", encoding="utf-8") as f:
+        tmpl = yaml.safe_load(f)
+
+    # 폴더 내 모든 info.json 처리 (파일별로 독립적이므로 CPU 코어 수만큼 병렬 처리)
+    json_paths = [os.path.join(args.json_folder, file) for file in os.listdir(args.json_folder) if file.endswith(".json")]
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=init_worker,
+                             initargs=(tmpl, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))) as ex:
+        list(ex.map(json_to_nfo, json_paths, chunksize=16))
+
+if __name__ == "__main__":
+    main()
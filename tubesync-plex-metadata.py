@@ -3,19 +3,56 @@ import os
 import sys
 import json
 import time
+import errno
+import atexit
+import signal
 import threading
-import queue
+import heapq
+import random
 import hashlib
 import logging
 import platform
 import shutil
 import subprocess
+import io
+import inspect
 from pathlib import Path
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib3.util.retry import Retry
 import requests
 from requests.adapters import HTTPAdapter
 
+# Fast JSON (optional, falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# MessagePack cache (optional, falls back to JSON)
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Streaming JSON for ffprobe output (optional, falls back to a full parse)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# In-process libavformat probing (optional, falls back to spawning ffprobe)
+try:
+    import av
+except ImportError:
+    av = None
+
+# SIMD NFO hashing (optional, falls back to hashlib MD5)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 # XML parsing
 import lxml.etree as ET
 
@@ -24,6 +61,7 @@ from plexapi.server import PlexServer
 
 # File monitoring
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler, PatternMatchingEventHandler
 
 # argparse
@@ -38,6 +76,7 @@ parser.add_argument("--disable-watchdog", action="store_true", help="Disable fol
 parser.add_argument("--DETAIL", action="store_true", help="Enable detailed logging")
 parser.add_argument("--debug-http", action="store_true", help="Enable HTTP debug logging")
 parser.add_argument("--debug", action="store_true", help="Enable debug mode (implies DETAIL logging)")
+parser.add_argument("--poll-interval", type=float, help="Watch folders by polling every N seconds instead of native events (NFS/SMB)")
 parser.add_argument("--base-dir", help="Base directory override", default=os.environ.get("BASE_DIR", str(Path(__file__).parent.resolve())))
 args = parser.parse_args()
 
@@ -50,7 +89,9 @@ DETAIL = args.DETAIL or args.debug
 DEBUG_HTTP = args.debug_http
 
 CONFIG_FILE = Path(args.config).resolve()
-CACHE_FILE = CONFIG_FILE.parent / "tubesync_cache.json"
+LEGACY_CACHE_FILE = CONFIG_FILE.parent / "tubesync_cache.json"
+CACHE_FILE = CONFIG_FILE.parent / "tubesync_cache.msgpack" if msgspec else LEGACY_CACHE_FILE
+CACHE_LOG_FILE = CONFIG_FILE.parent / "tubesync_cache.log.jsonl"  # append-only changes since the last snapshot
 
 VENVDIR = BASE_DIR / "venv"
 FFMPEG_BIN = VENVDIR / "bin/ffmpeg"
@@ -58,16 +99,109 @@ FFPROBE_BIN = VENVDIR / "bin/ffprobe"
 FFMPEG_VERSION_FILE = BASE_DIR / ".ffmpeg_version"
 
 VIDEO_EXTS = (".mkv", ".mp4", ".avi", ".mov", ".wmv", ".flv", ".m4v")
-cache_lock = threading.Lock()
+VIDEO_EXTS_SET = frozenset(VIDEO_EXTS)
+# Media extensions as written on disk (lower and upper case) -> canonical form,
+# so the common spellings are classified with one dict lookup and no .lower() copy
+MEDIA_EXT_CANON = {e: ext for ext in VIDEO_EXTS + (".nfo",) for e in (ext, ext.upper())}
+
+def file_ext(path):
+    """Lower-cased extension of a path string ('' if none), without building a Path."""
+    i = path.rfind(".")
+    if i < 0:
+        return ""
+    ext = path[i:]
+    return MEDIA_EXT_CANON.get(ext) or ext.lower()
 
 # Language mapping for subtitles
 LANG_MAP = {
     "eng": "en", "jpn": "ja", "kor": "ko", "fre": "fr", "fra": "fr",
     "spa": "es", "ger": "de", "deu": "de", "ita": "it", "chi": "zh", "und": "und"
 }
+# Pre-insert the common case variants so the per-stream lookup needs no .lower()
+LANG_MAP = {v: sys.intern(lang) for code, lang in LANG_MAP.items()
+            for v in (code, code.upper(), code.title())}
 
 def map_lang(code):
-    return LANG_MAP.get(code.lower(), "und")
+    lang = LANG_MAP.get(code)
+    if lang is None:
+        lang = LANG_MAP.get(code.lower(), "und")
+    return lang
+
+# ==============================
+# JSON helpers (orjson when available)
+# ==============================
+def json_loads(data):
+    """Decode JSON from bytes/str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj):
+    """
+    Encode obj as compact single-line UTF-8 JSON bytes (cache snapshots and log records).
+    No indentation: these files are machine-read, and orjson's compact path is its fastest.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def write_file_atomic(path, payload):
+    """Write bytes with a single buffered write to a temp file, then os.replace() it over path."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+# ==============================
+# Cache serialization (MessagePack when available)
+# ==============================
+if msgspec is not None:
+    _cache_encoder = msgspec.msgpack.Encoder()
+    _cache_decoder = msgspec.msgpack.Decoder(dict)
+
+def cache_encode(obj):
+    if msgspec is not None:
+        return _cache_encoder.encode(obj)
+    return json_dumps(obj)
+
+def cache_decode(data):
+    if msgspec is not None:
+        return _cache_decoder.decode(data)
+    return json_loads(data)
+
+CACHE_FORMAT_VERSION = 2
+
+def cache_pack(flat, log_gen=0):
+    """
+    {"/dir/file.mkv": entry} -> {"version": 2, "log_gen": n, "dirs": {"/dir": {"file.mkv": entry}}}
+    Each directory prefix is stored once instead of once per file.
+    log_gen: generation of the change log that continues this snapshot.
+    """
+    dirs = {}
+    for path, entry in flat.items():
+        dir_name, file_name = os.path.split(path)
+        files = dirs.get(dir_name)
+        if files is None:
+            files = dirs[dir_name] = {}
+        files[file_name] = entry
+    return {"version": CACHE_FORMAT_VERSION, "log_gen": log_gen, "dirs": dirs}
+
+def cache_unpack(data):
+    """Inverse of cache_pack(); a legacy flat cache (no "version" key) is returned as is."""
+    if data.get("version") != CACHE_FORMAT_VERSION:
+        return data
+    join = os.path.join
+    return {
+        join(dir_name, file_name): entry
+        for dir_name, files in data["dirs"].items()
+        for file_name, entry in files.items()
+    }
 
 # ==============================
 # Default config skeleton
@@ -80,11 +214,12 @@ default_config = {
         "SILENT": "true = only summary logs, False = detailed logs",
         "DETAIL": "true = verbose mode (debug output)",
         "SUBTITLES": "true = extract and upload SUBTITLES",
-        "THREADS": "Number of worker THREADS for initial scanning",
+        "THREADS": "Number of worker THREADS for initial scanning; 0 = auto (CPU count + 4, max 32)",
         "MAX_CONCURRENT_REQUESTS": "Max concurrent Plex API requests",
         "REQUEST_DELAY": "Delay between Plex API requests (sec)",
         "WATCH_FOLDERS": "true = enable real-time folder monitoring",
         "WATCH_DEBOUNCE_DELAY": "Debounce time (sec) before processing events",
+        "WATCH_POLL_INTERVAL": "Polling interval (sec) for watched folders; 0 = native events, auto-polls network shares",
         "ALWAYS_APPLY_NFO": "true = always apply NFO metadata regardless of hash",
         "DELETE_NFO_AFTER_APPLY": "true = remove NFO file after applying"
     },
@@ -94,11 +229,12 @@ default_config = {
     "SILENT": False,
     "DETAIL": False,
     "SUBTITLES": False,
-    "THREADS": 8,
+    "THREADS": 0,
     "MAX_CONCURRENT_REQUESTS": 4,
     "REQUEST_DELAY": 0.2,
     "WATCH_FOLDERS": False,
     "WATCH_DEBOUNCE_DELAY": 3,
+    "WATCH_POLL_INTERVAL": 0,
     "ALWAYS_APPLY_NFO": False,
     "DELETE_NFO_AFTER_APPLY": True,
 }
@@ -108,13 +244,11 @@ default_config = {
 # ==============================
 if not CONFIG_FILE.exists():
     CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with CONFIG_FILE.open("w", encoding="utf-8") as f:
-        json.dump(default_config, f, indent=4, ensure_ascii=False)
+    write_file_atomic(CONFIG_FILE, json.dumps(default_config, indent=4, ensure_ascii=False).encode("utf-8"))
     print(f"[INFO] {CONFIG_FILE} created. Please edit it and rerun.")
     sys.exit(0)
 
-with CONFIG_FILE.open("r", encoding="utf-8") as f:
-    config = json.load(f)
+config = json_loads(CONFIG_FILE.read_bytes())
 
 # ==============================
 # Apply config to globals
@@ -128,13 +262,16 @@ SILENT                 = config.get("SILENT", False)
 DELETE_NFO_AFTER_APPLY = config.get("DELETE_NFO_AFTER_APPLY", True)
 SUBTITLES_ENABLED      = config.get("SUBTITLES", False)
 ALWAYS_APPLY_NFO       = config.get("ALWAYS_APPLY_NFO", True)
-THREADS                = config.get("THREADS", 8)
-MAX_CONCURRENT_REQUESTS= config.get("MAX_CONCURRENT_REQUESTS", 2)
+# Work is I/O-bound (Plex HTTP + subprocesses): same default as ThreadPoolExecutor itself
+DEFAULT_THREADS        = min(32, (os.cpu_count() or 1) + 4)
+THREADS                = int(os.environ.get("THREAD_POOL_SIZE") or config.get("THREADS") or 0)
+THREADS                = THREADS if THREADS > 0 else DEFAULT_THREADS  # 0 / negative = auto
+# More request slots than workers could never be used
+MAX_CONCURRENT_REQUESTS= max(1, min(config.get("MAX_CONCURRENT_REQUESTS", 2), THREADS))
 REQUEST_DELAY          = config.get("REQUEST_DELAY", 0.1)
 WATCH_FOLDERS          = config.get("WATCH_FOLDERS", True)
 WATCH_DEBOUNCE_DELAY   = config.get("WATCH_DEBOUNCE_DELAY", 2)
-
-api_semaphore = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
+WATCH_POLL_INTERVAL    = args.poll_interval if args.poll_interval is not None else config.get("WATCH_POLL_INTERVAL", 0)
 
 # ==============================
 # Logging setup
@@ -197,17 +334,19 @@ logging.info(f"MAX_CONCURRENT_REQUESTS = {MAX_CONCURRENT_REQUESTS}")
 logging.info(f"REQUEST_DELAY = {REQUEST_DELAY}")
 logging.info(f"WATCH_FOLDERS = {WATCH_FOLDERS}")
 logging.info(f"WATCH_DEBOUNCE_DELAY = {WATCH_DEBOUNCE_DELAY}")
+logging.info(f"WATCH_POLL_INTERVAL = {WATCH_POLL_INTERVAL}")
 
 # ==============================
 # HTTP debug session
 # ==============================
 class HTTPDebugSession(requests.Session):
-    def __init__(self, enable_debug=False):
+    def __init__(self, enable_debug=False, pool_maxsize=20):
         super().__init__()
         self.enable_debug = enable_debug
         retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[500,502,503,504])
-        self.mount("http://", HTTPAdapter(max_retries=retries))
-        self.mount("https://", HTTPAdapter(max_retries=retries))
+        adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
 
     def send(self, request, **kwargs):
         if self.enable_debug:
@@ -217,31 +356,19 @@ class HTTPDebugSession(requests.Session):
             print("[HTTP DEBUG] RESPONSE:", response.status_code, response.reason)
         return response
 
-# ==============================
-# Plex server wrapper
-# ==============================
-class PlexServerWithHTTPDebug(PlexServer):
-    def __init__(self, baseurl, token, debug_http=False):
-        super().__init__(baseurl, token)
-        self._debug_session = HTTPDebugSession(enable_debug=debug_http)
-
-    def _request(self, path, method="GET", headers=None, params=None, data=None, timeout=None):
-        url = self._buildURL(path)
-        req_headers = headers or {}
-        if self._token:
-            req_headers["X-Plex-Token"] = self._token
-        resp = self._debug_session.request(method, url, headers=req_headers, params=params, data=data, timeout=timeout)
-        resp.raise_for_status()
-        return resp
+# One keep-alive connection pool for the whole process (Plex API + FFmpeg downloads).
+# Sized so every processing worker and subtitle uploader can hold a connection at once;
+# a smaller pool makes urllib3 discard connections and reconnect instead of reusing them.
+http_session = HTTPDebugSession(enable_debug=DEBUG_HTTP, pool_maxsize=max(10, THREADS + MAX_CONCURRENT_REQUESTS))
 
 # ==============================
 # Connect to Plex
 # ==============================
 try:
-    plex = PlexServerWithHTTPDebug(
+    plex = PlexServer(
         config["PLEX_BASE_URL"],
         config["PLEX_TOKEN"],
-        debug_http=DEBUG_HTTP
+        session=http_session
     )
 except Exception as e:
     logging.error(f"Failed to connect to Plex: {e}")
@@ -250,54 +377,326 @@ except Exception as e:
 # ==============================
 # Cache handling (integrated by video)
 # ==============================
-if CACHE_FILE.exists():
-    with CACHE_FILE.open("r", encoding="utf-8") as f:
-        cache = json.load(f)
-else:
-    cache = {}
+def replay_cache_log(loaded, log_gen):
+    """
+    Apply CACHE_LOG_FILE records ({"p": path, "e": entry or None}) on top of a snapshot.
+    The log is only replayed if its header generation matches the snapshot's log_gen:
+    a compaction interrupted after writing the snapshot leaves an older log, already included.
+    Returns the number of records applied.
+    """
+    try:
+        lines = CACHE_LOG_FILE.read_bytes().split(b"\n")
+    except FileNotFoundError:
+        return 0
+    try:
+        if json_loads(lines[0]).get("gen") != log_gen:
+            return 0
+    except ValueError:
+        return 0
+    applied = 0
+    for line in lines[1:]:
+        if not line:
+            continue
+        try:
+            record = json_loads(line)
+        except ValueError:
+            logging.warning("[CACHE] Skipping unreadable cache log record")
+            continue
+        if record["e"] is None:
+            loaded.pop(record["p"], None)
+        else:
+            loaded[record["p"]] = record["e"]
+        applied += 1
+    return applied
 
+def init_cache(cache_file):
+    """
+    Single entry point for loading the cache: snapshot + replayed change log.
+    Migrates a legacy JSON cache to MessagePack once when msgspec is available.
+    Returns (cache, log_gen, log_records).
+    """
+    global _log_reset_pending
+    if cache_file != LEGACY_CACHE_FILE and not cache_file.exists() and LEGACY_CACHE_FILE.exists():
+        # Fold the legacy snapshot's log in first, then compact into a new generation
+        # (same order as compact_cache: snapshot, then log reset)
+        raw = json_loads(LEGACY_CACHE_FILE.read_bytes())
+        loaded = cache_unpack(raw)
+        log_records = replay_cache_log(loaded, raw.get("log_gen", 0))
+        log_gen = raw.get("log_gen", 0) + 1
+        write_file_atomic(cache_file, cache_encode(cache_pack(loaded, log_gen)))
+        try:
+            write_file_atomic(CACHE_LOG_FILE, json_dumps({"gen": log_gen}) + b"\n")
+        except Exception as e:
+            _log_reset_pending = True  # first append truncates the stale log instead
+            logging.error(f"[CACHE] Failed to reset {CACHE_LOG_FILE}: {e}")
+        LEGACY_CACHE_FILE.unlink()
+        logging.info(f"[CACHE] Migrated {LEGACY_CACHE_FILE} -> {cache_file}, {len(loaded)} entries"
+                     f" ({log_records} log records folded in)")
+        return loaded, log_gen, 0
+    loaded, log_gen = {}, 0
+    if cache_file.exists():
+        raw = cache_decode(cache_file.read_bytes())
+        loaded = cache_unpack(raw)
+        log_gen = raw.get("log_gen", 0)
+    log_records = replay_cache_log(loaded, log_gen)
+    if log_records:
+        logging.info(f"[CACHE] Replayed {log_records} records from {CACHE_LOG_FILE}")
+    return loaded, log_gen, log_records
+
+_log_reset_pending = False         # compaction wrote the snapshot but could not reset the log
+cache, _log_gen, _log_records = init_cache(CACHE_FILE)
 cache_modified = False
-cache_lock = threading.Lock()  # 🔹 Added to ensure thread-safety
+cache_lock = threading.Lock()  # the only lock guarding cache / cache_modified / _dirty_keys
+_dirty_keys = set()                # paths changed since the last log append
+
+CACHE_FLUSH_INTERVAL = 5           # Debounce (sec) for background cache flush
+CACHE_LOG_COMPACT_MIN = 10000      # compact once the log has this many records (and more than the cache has entries)
+_dirty_since = None                # monotonic time of the first unsaved change
+CACHE_FLUSH_MAX_DIRTY = 5000       # flush early once this many entries are pending
+_flush_stop = threading.Event()
+_flush_wake = threading.Event()    # set on shutdown or when CACHE_FLUSH_MAX_DIRTY is reached
+
+_cache_save_lock = threading.Lock()  # serializes writers only; updates never wait on disk I/O
+
+def append_cache_log(records):
+    """Append records as JSON lines with one write; a new/reset log starts with its generation header."""
+    global _log_reset_pending
+    flags = os.O_RDWR | os.O_CREAT | (os.O_TRUNC if _log_reset_pending else os.O_APPEND)
+    payload = b"".join(json_dumps(r) + b"\n" for r in records)
+    fd = os.open(CACHE_LOG_FILE, flags, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            payload = json_dumps({"gen": _log_gen}) + b"\n" + payload
+        else:
+            os.lseek(fd, size - 1, os.SEEK_SET)
+            if os.read(fd, 1) != b"\n":
+                payload = b"\n" + payload  # terminate a record torn by a crash so this batch stays readable
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    _log_reset_pending = False
 
 def save_cache():
-    global cache_modified
-    with cache_lock:
-        if cache_modified:
-            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with CACHE_FILE.open("w", encoding="utf-8") as f:
-                json.dump(cache, f, indent=2, ensure_ascii=False)
-            logging.info(f"[CACHE] Saved to {CACHE_FILE}, {len(cache)} entries")
+    """
+    Append the entries changed since the last call to the cache log: O(changes), not O(cache).
+    Each dirty path is written once with its current value (None = removed).
+    The log is folded into a full snapshot by compact_cache() once it grows large.
+    """
+    global cache_modified, _dirty_since, _log_records
+    with _cache_save_lock:
+        with cache_lock:
+            if not cache_modified:
+                return
+            records = [{"p": p, "e": cache.get(p)} for p in _dirty_keys]
+            _dirty_keys.clear()
             cache_modified = False
+            _dirty_since = None
+        try:
+            CACHE_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            append_cache_log(records)
+        except Exception:
+            with cache_lock:
+                _dirty_keys.update(r["p"] for r in records)
+                cache_modified = True
+            raise
+        _log_records += len(records)
+        logging.info(f"[CACHE] Logged {len(records)} changes to {CACHE_LOG_FILE}")
+    if _log_records >= max(CACHE_LOG_COMPACT_MIN, len(cache)):
+        compact_cache()
+
+def compact_cache():
+    """
+    Write a full snapshot and start a new, empty log generation.
+    Snapshot is taken under cache_lock, then encoded and written outside it;
+    entries are replaced (never mutated in place), so a shallow copy is consistent.
+    """
+    global cache_modified, _dirty_since, _log_gen, _log_records, _log_reset_pending
+    with _cache_save_lock:
+        with cache_lock:
+            if not cache_modified and not _log_records and CACHE_FILE.exists():
+                return
+            snapshot = dict(cache)
+            dirty = set(_dirty_keys)
+            _dirty_keys.clear()
+            cache_modified = False
+            _dirty_since = None
+        new_gen = _log_gen + 1
+        try:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            write_file_atomic(CACHE_FILE, cache_encode(cache_pack(snapshot, new_gen)))
+        except Exception:
+            with cache_lock:
+                _dirty_keys.update(dirty)
+                cache_modified = True
+            raise
+        _log_gen = new_gen
+        _log_records = 0
+        try:
+            write_file_atomic(CACHE_LOG_FILE, json_dumps({"gen": new_gen}) + b"\n")
+        except Exception as e:
+            _log_reset_pending = True  # next append truncates the stale log instead
+            logging.error(f"[CACHE] Failed to reset {CACHE_LOG_FILE}: {e}")
+        logging.info(f"[CACHE] Saved to {CACHE_FILE}, {len(snapshot)} entries")
 
-def update_cache(video_path, ratingKey=None, nfo_hash=None):
+# ==============================
+# Directory index over cache keys (guarded by cache_lock)
+# ==============================
+# dir -> cached video paths directly inside it, dir -> child dirs holding cached videos.
+# A folder delete/move finds its entries in O(entries under it) instead of scanning the whole cache.
+_dir_files = {}
+_dir_subdirs = {}
+
+def _dir_index_add(path):
+    d = os.path.dirname(path)
+    files = _dir_files.get(d)
+    if files is None:
+        _dir_files[d] = files = set()
+        # link d under its ancestors, stopping at the first one already known
+        while True:
+            parent = os.path.dirname(d)
+            if parent == d:
+                break
+            known = parent in _dir_files or parent in _dir_subdirs
+            _dir_subdirs.setdefault(parent, set()).add(d)
+            if known:
+                break
+            d = parent
+    files.add(path)
+
+def _dir_index_remove(path):
+    d = os.path.dirname(path)
+    files = _dir_files.get(d)
+    if files is None:
+        return
+    files.discard(path)
+    if files:
+        return
+    del _dir_files[d]
+    # unlink directories left with no cached videos, walking up
+    while d not in _dir_files and not _dir_subdirs.get(d):
+        _dir_subdirs.pop(d, None)
+        parent = os.path.dirname(d)
+        siblings = _dir_subdirs.get(parent)
+        if parent == d or siblings is None:
+            break
+        siblings.discard(d)
+        d = parent
+
+def cached_paths_under(root):
+    """Cached video paths equal to root or anywhere below directory root (call with cache_lock held)."""
+    found = [root] if root in cache else []
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        found.extend(_dir_files.get(d, ()))
+        stack.extend(_dir_subdirs.get(d, ()))
+    return found
+
+for _path in cache:
+    _dir_index_add(_path)
+
+def _mark_cache_dirty(path):
+    """Flag path as changed for the background flusher and keep the directory index in step (call with cache_lock held)."""
+    global cache_modified, _dirty_since
+    if path in cache:
+        _dir_index_add(path)
+    else:
+        _dir_index_remove(path)
+    _dirty_keys.add(path)
+    if len(_dirty_keys) == CACHE_FLUSH_MAX_DIRTY:
+        _flush_wake.set()
+    cache_modified = True
+    if _dirty_since is None:
+        _dirty_since = time.monotonic()
+
+def update_cache(path, ratingKey=None, nfo_hash=None, nfo_stat=None, subs=None, video_stat=None):
     """
-    Add or update an entry in the cache.
+    Add or update an entry in the cache (copy-on-write per entry).
+    path: absolute video path as str (the cache key)
+    nfo_stat: os.stat_result of the applied NFO; its mtime/size let unchanged NFOs skip hashing.
+    subs / video_stat: probed subtitle streams and the video stat they were probed at.
     """
-    global cache_modified
-    path = str(video_path)
     with cache_lock:
-        current = cache.get(path, {})
+        current = dict(cache.get(path) or ())
         if ratingKey is not None:
             current["ratingKey"] = ratingKey
         if nfo_hash is not None:
             current["nfo_hash"] = nfo_hash
+        if nfo_stat is not None:
+            current["nfo_mtime_ns"] = nfo_stat.st_mtime_ns
+            current["nfo_size"] = nfo_stat.st_size
+        if subs is not None:
+            current["subs"] = subs
+            current["subs_mtime_ns"] = video_stat.st_mtime_ns
+            current["subs_size"] = video_stat.st_size
         cache[path] = current
-        cache_modified = True
-        if DETAIL:
-            logging.debug(f"[CACHE] update_cache: {path} => {current}")
+        _mark_cache_dirty(path)
+    if DETAIL:
+        logging.debug(f"[CACHE] update_cache: {path} => {current}")
 
-def remove_from_cache(video_path):
+def set_cached_ratingkeys(ratingkeys):
     """
-    Remove a file entry from the cache (safe even if it doesn't exist).
+    Store {path: ratingKey} for many entries under a single cache_lock acquisition.
+    Paths removed from the cache since the caller looked them up (e.g. a watchdog delete)
+    are skipped rather than brought back. Returns the paths actually updated.
     """
-    global cache_modified
-    path = str(video_path)
+    stored = []
     with cache_lock:
-        if path in cache:
-            cache.pop(path, None)
-            cache_modified = True
-            if DETAIL:
-                logging.debug(f"[CACHE] remove_from_cache: {path}")
+        for path, ratingKey in ratingkeys.items():
+            current = cache.get(path)
+            if current is None:
+                continue
+            current = dict(current)
+            current["ratingKey"] = ratingKey
+            cache[path] = current
+            _mark_cache_dirty(path)
+            stored.append(path)
+    return stored
+
+def remove_from_cache(path):
+    """
+    Remove a file entry (absolute path str) from the cache (safe even if it doesn't exist).
+    """
+    with cache_lock:
+        if path not in cache:
+            return
+        del cache[path]
+        _mark_cache_dirty(path)
+    if DETAIL:
+        logging.debug(f"[CACHE] remove_from_cache: {path}")
+
+def _cache_flush_loop():
+    """Background flusher: collapse bursts of cache updates into one write (sooner if many are pending)."""
+    while True:
+        _flush_wake.wait(CACHE_FLUSH_INTERVAL)
+        if _flush_stop.is_set():
+            break
+        _flush_wake.clear()
+        dirty_since = _dirty_since
+        if cache_modified and (len(_dirty_keys) >= CACHE_FLUSH_MAX_DIRTY or dirty_since is None
+                               or time.monotonic() - dirty_since >= CACHE_FLUSH_INTERVAL):
+            try:
+                save_cache()
+            except Exception as e:
+                logging.error(f"[CACHE] Background save failed: {e}")
+
+def start_cache_flusher():
+    threading.Thread(target=_cache_flush_loop, name="cache-flusher", daemon=True).start()
+
+def _handle_sigterm(signum, frame):
+    # Raise SystemExit so atexit handlers (final cache flush) run
+    sys.exit(0)
+
+def _flush_cache_on_exit():
+    _flush_stop.set()
+    _flush_wake.set()
+    compact_cache()
+
+# Always flush pending cache changes on interpreter exit
+atexit.register(_flush_cache_on_exit)
 
 # ==============================
 # FFmpeg setup (from GitHub)
@@ -321,7 +720,7 @@ def setup_ffmpeg():
     # 이미 최신 버전인지 확인
     remote_version = None
     try:
-        r = requests.get(version_url, timeout=10)
+        r = http_session.get(version_url, timeout=10)
         r.raise_for_status()
         remote_version = r.text.strip()
         logging.info(f"Remote FFmpeg version: {remote_version}")
@@ -341,33 +740,61 @@ def setup_ffmpeg():
         logging.info(f"FFmpeg already up-to-date ({local_version})")
         return
 
-    # 기존 파일 삭제
-    for f in (FFMPEG_BIN, FFPROBE_BIN):
-        if f.exists():
-            f.unlink()
+    # 무결성 검사용 SHA-256 (None only when not published; any other failure raises)
+    def fetch_sha256(url):
+        r = http_session.get(url + ".sha256", timeout=10)
+        if r.status_code == 404:
+            logging.debug(f"No SHA-256 published for {url}, skipping check")
+            return None
+        r.raise_for_status()
+        return r.text.split()[0].lower()
 
-    # 다운로드 함수
+    # 다운로드 함수 (hashes bytes in flight, so the file is never re-read for the check)
     def download_file(url, path):
         try:
-            r = requests.get(url, stream=True, timeout=60)
-            r.raise_for_status()
-            with open(path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            expected = fetch_sha256(url)
+        except Exception as e:
+            # The checksum exists but could not be read: never install an unverified binary
+            logging.error(f"Failed to fetch SHA-256 for {url}: {e}")
+            return False
+        sha = hashlib.sha256()  # hardware-accelerated via OpenSSL SHA-NI / ARMv8 CE
+        buf = bytearray(1024 * 1024)
+        view = memoryview(buf)
+        try:
+            # Binaries are already compressed: ask for identity and move 1 MiB blocks
+            with http_session.get(url, stream=True, timeout=60, headers={"Accept-Encoding": "identity"}) as r:
+                r.raise_for_status()
+                r.raw.decode_content = True
+                with open(path, "wb") as f:
+                    while True:
+                        n = r.raw.readinto(buf)
+                        if not n:
+                            break
+                        f.write(view[:n])
+                        sha.update(view[:n])
             logging.info(f"Downloaded {url}")
-            return True
         except Exception as e:
             logging.error(f"Failed to download {url}: {e}")
             return False
+        actual = sha.hexdigest()
+        if expected is not None and actual != expected:
+            logging.error(f"SHA-256 mismatch for {url}: expected {expected}, got {actual}")
+            return False
+        return True
 
-    # 다운로드 수행
-    ok1 = download_file(ffmpeg_url, tar_ffmpeg)
-    ok2 = download_file(ffprobe_url, tar_ffprobe)
-    if not (ok1 and ok2):
-        logging.error("Failed to download one or more FFmpeg binaries.")
+    # 다운로드 수행 (ffmpeg / ffprobe in parallel — both are network-bound)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(download_file, url, path)
+            for url, path in ((ffmpeg_url, tar_ffmpeg), (ffprobe_url, tar_ffprobe))
+        ]
+        results = [fut.result() for fut in as_completed(futures)]
+    if not all(results):
+        logging.error("Failed to download or verify one or more FFmpeg binaries.")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
         return
 
-    # 설치 (권한 설정)
+    # 설치 (권한 설정) — existing binaries are only replaced once both downloads are verified
     try:
         shutil.move(str(tar_ffmpeg), FFMPEG_BIN)
         shutil.move(str(tar_ffprobe), FFPROBE_BIN)
@@ -388,55 +815,165 @@ def setup_ffmpeg():
 # ==============================
 # Plex helpers
 # ==============================
-def find_plex_item(abs_path):
-    abs_path = os.path.abspath(abs_path)
-    for lib_id in config.get("PLEX_LIBRARY_IDS", []):
+def _section_items(section):
+    # section.TYPE may not exist; use section.TYPE or section.type if present
+    section_type = getattr(section, "TYPE", None) or getattr(section, "type", "")
+    section_type = str(section_type).lower()
+    if section_type == "show":
+        return section.search(libtype="episode")
+    elif section_type in ("movie", "video"):
+        return section.search(libtype="movie")
+    # try a broad search fallback
+    return section.search()
+
+def _item_parts(item):
+    # parts: try several access patterns
+    try:
+        return item.iterParts()
+    except Exception:
         try:
-            section = plex.library.sectionByID(lib_id)
+            return getattr(item, "parts", []) or []
         except Exception:
-            continue
+            return []
 
-        # section.TYPE may not exist; use section.TYPE or section.type if present
-        section_type = getattr(section, "TYPE", None) or getattr(section, "type", "")
-        section_type = str(section_type).lower()
-        if section_type == "show":
-            results = section.search(libtype="episode")
-        elif section_type in ("movie", "video"):
-            results = section.search(libtype="movie")
-        else:
-            # try a broad search fallback
-            results = section.search()
+# ==============================
+# Plex sections (looked up once; retried after failures)
+# ==============================
+_plex_sections = None
+_plex_sections_retry_at = None     # monotonic time after which a lookup that had failures is redone
+PLEX_SECTIONS_RETRY_INTERVAL = 300
+
+def get_plex_sections():
+    """
+    [section] for PLEX_LIBRARY_IDS, resolved on first use; IDs that fail are logged and skipped.
+    A result with failures (e.g. Plex unreachable at startup) is only kept for
+    PLEX_SECTIONS_RETRY_INTERVAL, so a long watchdog session is not left without libraries.
+    """
+    global _plex_sections, _plex_sections_retry_at
+    if _plex_sections is None or (_plex_sections_retry_at is not None
+                                  and time.monotonic() >= _plex_sections_retry_at):
+        sections = []
+        failed = False
+        for lib_id in config.get("PLEX_LIBRARY_IDS", []):
+            try:
+                sections.append(plex.library.sectionByID(lib_id))
+            except Exception as e:
+                failed = True
+                logging.warning(f"[PLEX] Library section {lib_id} not found: {e}")
+        _plex_sections = sections
+        _plex_sections_retry_at = time.monotonic() + PLEX_SECTIONS_RETRY_INTERVAL if failed else None
+    return _plex_sections
 
-        for item in results:
-            # parts: try several access patterns
-            parts_iter = []
+def get_library_paths():
+    """Folder locations of every configured library section."""
+    return tuple(loc for section in get_plex_sections() for loc in getattr(section, "locations", []))
+
+# ==============================
+# Plex path index: abs_path -> item, built with one library walk
+# ==============================
+_plex_path_index = {}
+_plex_index_stale = True
+_plex_index_built_at = None        # time.monotonic() of the last build
+_plex_index_lock = threading.Lock()
+PLEX_INDEX_MIN_REBUILD_INTERVAL = 30  # seconds; lookup misses in a burst of new files share one rebuild
+
+def _section_part_paths(section):
+    """[(part path, item)] for every media part in one library section."""
+    pairs = []
+    for item in _section_items(section):
+        for part in _item_parts(item):
             try:
-                parts_iter = item.iterParts()
+                pairs.append((os.path.normpath(part.file), item))  # Plex part paths are already absolute
             except Exception:
-                try:
-                    parts_iter = getattr(item, "parts", []) or []
-                except Exception:
-                    parts_iter = []
+                continue
+    return pairs
+
+def build_plex_path_index():
+    """Walk every configured library once and map each media part path to its item."""
+    global _plex_path_index, _plex_index_stale, _plex_index_built_at
+    sections = get_plex_sections()
+    if len(sections) > 1:
+        # Each section is one large, network-bound search: fetch them concurrently
+        with ThreadPoolExecutor(max_workers=max(1, min(len(sections), MAX_CONCURRENT_REQUESTS))) as executor:
+            per_section = list(executor.map(_section_part_paths, sections))
+    else:
+        per_section = [_section_part_paths(section) for section in sections]
+    index = {}
+    for pairs in per_section:  # in PLEX_LIBRARY_IDS order, so the first library still wins on duplicates
+        for path, item in pairs:
+            index.setdefault(path, item)
+    _plex_path_index = index
+    _plex_index_stale = False
+    _plex_index_built_at = time.monotonic()
+    logging.info(f"[PLEX] Path index built: {len(index)} media parts")
+
+def invalidate_plex_path_index():
+    """Mark the index stale; it is rebuilt on the next lookup miss (new files, repair)."""
+    global _plex_index_stale
+    _plex_index_stale = True
+
+def ensure_plex_path_index(force=False):
+    """
+    Build the index now if it is stale, at most once per PLEX_INDEX_MIN_REBUILD_INTERVAL:
+    each rebuild walks the whole library, and items still missing are retried by the repair timer.
+    force: rebuild regardless of that interval (the repair pass itself)
+    """
+    if _plex_index_stale:
+        with _plex_index_lock:
+            if not _plex_index_stale:  # another thread rebuilt it while we waited
+                return
+            if (not force and _plex_index_built_at is not None
+                    and time.monotonic() - _plex_index_built_at < PLEX_INDEX_MIN_REBUILD_INTERVAL):
+                logging.debug("[PLEX] Path index rebuilt recently, keeping it for now")
+                return
+            build_plex_path_index()
 
-            for part in parts_iter:
-                try:
-                    if os.path.abspath(part.file) == abs_path:
-                        return item
-                except Exception:
-                    continue
-    return None
+def find_plex_item(abs_path):
+    if not os.path.isabs(abs_path):  # scan/watchdog paths are already absolute and normalized
+        abs_path = os.path.abspath(abs_path)
+    item = _plex_path_index.get(abs_path)
+    if item is None and _plex_index_stale:
+        ensure_plex_path_index()
+        item = _plex_path_index.get(abs_path)
+    return item
 
 # ==============================
 # NFO Processing (safe titleSort handling, retry-friendly)
 # ==============================
-deleted_nfo_set = set()
-nfo_lock = threading.Lock()
+def delete_applied_nfo(nfo_path):
+    """
+    Unlink an applied NFO. No lock or bookkeeping set: the filesystem is the source of truth,
+    and when two workers race for the same NFO the loser just sees FileNotFoundError.
+    """
+    try:
+        nfo_path.unlink()
+        if DETAIL:
+            logging.debug(f"[NFO] Deleted applied NFO: {nfo_path}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"[WARN] Failed to delete NFO {nfo_path}: {e}")
 
-def compute_nfo_hash(nfo_path):
+def compute_nfo_hash(nfo_path, data=None):
+    """xxh3_64 (or MD5 without xxhash) of the NFO; pass data when its bytes are already in memory.
+    Hashes are only compared with the cached value, so switching algorithms just re-applies each NFO once."""
     try:
-        with open(nfo_path, "rb") as f:
-            data = f.read()
-        h = hashlib.md5(data).hexdigest()
+        if xxhash is not None:
+            if data is None:
+                with open(nfo_path, "rb") as f:
+                    data = f.read()  # NFOs are a few KB; one read beats a chunk loop
+            h = xxhash.xxh3_64_hexdigest(data)
+        elif data is not None:
+            h = hashlib.md5(data).hexdigest()
+        else:
+            with open(nfo_path, "rb") as f:
+                if hasattr(hashlib, "file_digest"):  # Python 3.11+: read + hash loop runs in C
+                    h = hashlib.file_digest(f, "md5").hexdigest()
+                else:
+                    md5 = hashlib.md5()
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        md5.update(chunk)
+                    h = md5.hexdigest()
         if DETAIL:
             logging.debug(f"[NFO] compute_nfo_hash: {nfo_path} -> {h}")
         return h
@@ -444,61 +981,114 @@ def compute_nfo_hash(nfo_path):
         logging.error(f"[NFO] Failed to compute NFO hash: {nfo_path} - {e}")
         return None
 
-def safe_edit(ep, title=None, summary=None, aired=None):
+# str(nfo_path) -> (st_mtime_ns, st_size, hash) for NFOs hashed by this process, so an NFO that
+# is retried before its hash reaches the cache (Plex item not found yet, failed edit) is not re-read
+NFO_HASH_MEMO_MAX = 10000
+_nfo_hash_memo = {}
+
+def memo_nfo_hash(nfo_path, st, h):
+    if len(_nfo_hash_memo) >= NFO_HASH_MEMO_MAX:
+        _nfo_hash_memo.clear()
+    _nfo_hash_memo[str(nfo_path)] = (st.st_mtime_ns, st.st_size, h)
+
+def memoized_nfo_hash(nfo_path, st):
+    """Hash recorded for this exact mtime/size of nfo_path, or None."""
+    m = _nfo_hash_memo.get(str(nfo_path))
+    if m is not None and m[0] == st.st_mtime_ns and m[1] == st.st_size:
+        return m[2]
+    return None
+
+def nfo_stat_unchanged(st, cached):
+    """True if the NFO still has the mtime/size recorded when it was last hashed."""
+    return (
+        cached.get("nfo_hash") is not None
+        and cached.get("nfo_mtime_ns") == st.st_mtime_ns
+        and cached.get("nfo_size") == st.st_size
+    )
+
+def nfo_hash_for(nfo_path, st, cached):
+    """Cached hash if mtime/size are unchanged (no read), otherwise hash the file."""
+    if nfo_stat_unchanged(st, cached):
+        return cached["nfo_hash"]
+    h = memoized_nfo_hash(nfo_path, st)
+    if h is None:
+        h = compute_nfo_hash(nfo_path)
+        if h is not None:
+            memo_nfo_hash(nfo_path, st, h)
+    return h
+
+# (value key, locked key) for each safe_edit argument, in argument order
+EDIT_FIELDS = (
+    ("title.value", "title.locked"),
+    ("summary.value", "summary.locked"),
+    ("originallyAvailableAt.value", "originallyAvailableAt.locked"),
+    ("titleSort.value", "titleSort.locked"),
+)
+
+def safe_edit(ep, title=None, summary=None, aired=None, title_sort=None):
+    """All fields go out in a single edit PUT. The item is not reloaded afterwards: nothing
+    reads its metadata again, so a reload would only add a GET per NFO."""
     try:
         kwargs = {}
-        if title is not None:
-            kwargs['title.value'] = title
-            kwargs['title.locked'] = 1
-        if summary is not None:
-            kwargs['summary.value'] = summary
-            kwargs['summary.locked'] = 1
-        if aired is not None:
-            kwargs['originallyAvailableAt.value'] = aired
-            kwargs['originallyAvailableAt.locked'] = 1
+        for (value_key, locked_key), value in zip(EDIT_FIELDS, (title, summary, aired, title_sort)):
+            if value is not None:
+                kwargs[value_key] = value
+                kwargs[locked_key] = 1
 
         if kwargs:
             ep.edit(**kwargs)
-            ep.reload()
         return True
     except Exception as e:
         logging.error(f"[SAFE_EDIT] Failed to edit item: {e}", exc_info=True)
         return False
 
-def apply_nfo(ep, file_path):
-    nfo_path = Path(file_path).with_suffix(".nfo")
-    if not nfo_path.exists() or nfo_path.stat().st_size == 0:
-        return False
+NFO_FIELDS = ("title", "plot", "aired", "titleSort")
 
+def parse_nfo_fields(source):
+    """
+    Single-pass iterparse of the NFO (path str or binary file object): returns
+    {tag: stripped text} for the first occurrence of each NFO_FIELDS tag directly
+    under the root (same as root.findtext). Stops reading once every field is found;
+    elements already seen are dropped so memory stays flat on long actor/tag lists.
+    """
+    fields = {}
+    for _, elem in ET.iterparse(source, events=("end",), tag=NFO_FIELDS, recover=True,
+                                remove_blank_text=True, huge_tree=False):
+        parent = elem.getparent()
+        if parent is not None and parent.getparent() is None and elem.tag not in fields:
+            fields[elem.tag] = (elem.text or "").strip()
+            if len(fields) == len(NFO_FIELDS):
+                break
+        elem.clear()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    return fields
+
+def apply_nfo(ep, nfo_path, nfo_data=None):
+    """
+    nfo_path: existing, non-empty NFO (checked by process_nfo)
+    nfo_data: NFO bytes already read for hashing; parsed from memory instead of re-reading the file
+    """
     try:
-        tree = ET.parse(str(nfo_path), parser=ET.XMLParser(recover=True))
-        root = tree.getroot()
-        title = root.findtext("title", "").strip() or None
-        plot = root.findtext("plot", "").strip() or None
-        aired = root.findtext("aired", "").strip() or None
-        title_sort = root.findtext("titleSort", "").strip() or title
+        fields = parse_nfo_fields(io.BytesIO(nfo_data) if nfo_data is not None else str(nfo_path))
+        title = fields.get("title") or None
+        plot = fields.get("plot") or None
+        aired = fields.get("aired") or None
+        title_sort = fields.get("titleSort") or title
 
         if DETAIL:
-            logging.debug(f"[-] Applying NFO: {file_path} -> {title}")
-
-        if not safe_edit(ep, title=title, summary=plot, aired=aired):
-            return False
+            logging.debug(f"[-] Applying NFO: {nfo_path} -> {title}")
 
-        if title_sort:
-            try:
-                ep.editSortTitle(title_sort, locked=True)
-            except Exception:
-                ep.edit(**{"titleSort.value": title_sort, "titleSort.locked": 1})
-            ep.reload()
-
-        return True
+        return safe_edit(ep, title=title, summary=plot, aired=aired, title_sort=title_sort)
     except Exception as e:
         logging.error(f"[!] Error applying NFO {nfo_path}: {e}", exc_info=True)
         return False
 
-def process_nfo(file_path):
+def resolve_nfo_pair(file_path):
+    """Return (nfo_path, video_path) for either an NFO or a video path."""
     p = Path(file_path)
-    if p.suffix.lower() == ".nfo":
+    if file_ext(str(file_path)) == ".nfo":
         nfo_path = p
         video_path = p.with_suffix("")
         if not video_path.exists():
@@ -510,43 +1100,78 @@ def process_nfo(file_path):
     else:
         video_path = p
         nfo_path = p.with_suffix(".nfo")
+    return nfo_path, video_path
 
-    if not nfo_path.exists() or nfo_path.stat().st_size == 0:
-        return False
+def process_nfo(file_path, nfo_hash=None, plex_item=None, missing_ok=False, video_path=None, defer_fresh=False):
+    """
+    nfo_hash: precomputed NFO hash (see plan_nfo)
+    plex_item: prefetched Plex item for the cached ratingKey (see fetch_plex_items)
+    missing_ok: return True when the NFO does not exist (the stat doubles as the exists() check)
+    video_path: resolved video path str when the caller already knows it (skips the sibling probes)
+    defer_fresh: (watchdog) if the video was only just written, leave the Plex lookup and the
+                 apply to the scheduled repair pass instead of forcing an index rebuild now
+    """
+    if video_path is None:
+        nfo_path, video_path = resolve_nfo_pair(file_path)
+        str_video_path = None
+    else:
+        nfo_path, str_video_path = Path(file_path), video_path
 
-    str_video_path = str(video_path.resolve())
-    nfo_hash = compute_nfo_hash(nfo_path)
-    if nfo_hash is None:
+    try:
+        nfo_stat = nfo_path.stat()
+    except FileNotFoundError:
+        return missing_ok
+    if nfo_stat.st_size == 0:
         return False
 
+    if str_video_path is None:
+        str_video_path = os.path.abspath(video_path)  # NFO paths come from the scan / watchdog, already absolute
     cached = cache.get(str_video_path, {})
     cached_hash = cached.get("nfo_hash")
 
+    nfo_data = None
+    if nfo_hash is None:
+        if nfo_stat_unchanged(nfo_stat, cached):
+            nfo_hash = cached_hash
+        else:
+            # hashed on an earlier attempt? then apply_nfo reads the file only if it is applied
+            nfo_hash = memoized_nfo_hash(nfo_path, nfo_stat)
+        if nfo_hash is None:
+            # Read once: the same bytes are hashed here and parsed by apply_nfo
+            try:
+                nfo_data = nfo_path.read_bytes()
+            except OSError as e:
+                logging.error(f"[NFO] Failed to read NFO: {nfo_path} - {e}")
+                return False
+            nfo_hash = compute_nfo_hash(nfo_path, nfo_data)
+            if nfo_hash is not None:
+                memo_nfo_hash(nfo_path, nfo_stat, nfo_hash)
+    if nfo_hash is None:
+        return False
+
     # ✅ If NFO has already been applied, skip Plex calls
     if cached_hash == nfo_hash and not ALWAYS_APPLY_NFO:
         logging.info(f"[CACHE] Skipping already applied NFO: {str_video_path}")
+        if not nfo_stat_unchanged(nfo_stat, cached):
+            update_cache(str_video_path, nfo_stat=nfo_stat)  # same content, new mtime: refresh fast-path key
         if DELETE_NFO_AFTER_APPLY:
-            with nfo_lock:
-                if nfo_path not in deleted_nfo_set:
-                    try:
-                        nfo_path.unlink()
-                        if DETAIL:
-                            logging.debug(f"[NFO] Deleted already applied NFO: {nfo_path}")
-                    except Exception as e:
-                        logging.warning(f"[WARN] Failed to delete NFO {nfo_path}: {e}")
-                    deleted_nfo_set.add(nfo_path)
+            delete_applied_nfo(nfo_path)
         return True  # Considered successful even when skipped
 
     # ✅ Cache mismatch or forced application — call Plex
-    plex_item = None
     ratingKey = cached.get("ratingKey")
     if cached_hash != nfo_hash or ALWAYS_APPLY_NFO:
-        if ratingKey:
+        if ratingKey and plex_item is None:
             try:
                 plex_item = plex.fetchItem(ratingKey)
             except Exception:
                 plex_item = None
 
+        if not plex_item and defer_fresh and _is_fresh_file(str_video_path):
+            logging.debug(f"[NFO] Deferring NFO for new file to the repair pass: {str_video_path}")
+            schedule_cache_repair(DELAY_AFTER_NEW_FILE)
+            return True
+
         if not plex_item:
             plex_item = find_plex_item(str_video_path)
             if plex_item:
@@ -557,17 +1182,11 @@ def process_nfo(file_path):
 
     # ✅ Apply NFO
     if plex_item:
-        success = apply_nfo(plex_item, str_video_path)
+        success = apply_nfo(plex_item, nfo_path, nfo_data)
         if success:
-            update_cache(str_video_path, ratingKey=plex_item.ratingKey, nfo_hash=nfo_hash)
+            update_cache(str_video_path, ratingKey=plex_item.ratingKey, nfo_hash=nfo_hash, nfo_stat=nfo_stat)
             if DELETE_NFO_AFTER_APPLY:
-                with nfo_lock:
-                    if nfo_path not in deleted_nfo_set:
-                        try:
-                            nfo_path.unlink()
-                        except Exception as e:
-                            logging.warning(f"[WARN] Failed to delete NFO {nfo_path}: {e}")
-                        deleted_nfo_set.add(nfo_path)
+                delete_applied_nfo(nfo_path)
             return True
         else:
             return False  # 🔹 Return False if failed
@@ -575,38 +1194,158 @@ def process_nfo(file_path):
     return True  # No Plex call needed
 
 # ==============================
-# Unified file processing (video + NFO) — thread-safe with nfo_hash validation
+# Batched NFO processing (hash pass → one Plex request per batch)
 # ==============================
-processed_files = set()
-processed_files_lock = threading.Lock()
-file_queue = queue.Queue()
-logged_failures = set()
-logged_successes = set()
+PLEX_FETCH_BATCH = 100  # ratingKeys per /library/metadata request
+
+def plan_nfo(nfo_file):
+    """
+    Pass 1 (no Plex calls): hash the NFO and look up the cached ratingKey.
+    Returns (nfo_file, nfo_hash, ratingKey_to_fetch); ratingKey is None when
+    the NFO is already applied or the video has no cached ratingKey.
+    """
+    try:
+        nfo_path, video_path = resolve_nfo_pair(nfo_file)
+        try:
+            st = nfo_path.stat()
+        except FileNotFoundError:
+            return nfo_file, None, None
+        if st.st_size == 0:
+            return nfo_file, None, None
+        cached = cache.get(os.path.abspath(video_path), {})
+        nfo_hash = nfo_hash_for(nfo_path, st, cached)
+        if nfo_hash is None or (cached.get("nfo_hash") == nfo_hash and not ALWAYS_APPLY_NFO):
+            return nfo_file, nfo_hash, None
+        return nfo_file, nfo_hash, cached.get("ratingKey")
+    except Exception as e:
+        logging.warning(f"[NFO] Failed to plan {nfo_file}: {e}")
+        return nfo_file, None, None
+
+def fetch_plex_items(rating_keys):
+    """Fetch items by ratingKey with one request per PLEX_FETCH_BATCH keys. Returns {str(ratingKey): item}."""
+    keys = list(dict.fromkeys(str(k) for k in rating_keys))
+    items = {}
+    for i in range(0, len(keys), PLEX_FETCH_BATCH):
+        batch = keys[i:i + PLEX_FETCH_BATCH]
+        try:
+            for item in plex.fetchItems(f"/library/metadata/{','.join(batch)}"):
+                items[str(item.ratingKey)] = item
+        except Exception as e:
+            logging.warning(f"[PLEX] Batched fetch of {len(batch)} items failed: {e}")
+    log_detail(f"[PLEX] Prefetched {len(items)}/{len(keys)} items")
+    return items
 
-def process_file(file_path, schedule_timer=False):
+# ==============================
+# Unified file processing (video + NFO) — thread-safe with nfo_hash validation
+# ==============================
+class BoundedSet:
     """
-    Process file_path
-    schedule_timer: if True, schedules a delayed ratingKey repair for new files
+    Set of paths capped at `cap` entries; the least recently added are evicted first.
+    Paths are stored as 8-byte BLAKE2b digests (~40 bytes per entry instead of ~150 for the str).
+    Backed by an OrderedDict whose setdefault/popitem/pop are single atomic steps under the GIL,
+    so it is shared between worker threads without a lock.
     """
-    abs_path = Path(file_path).resolve()
-    str_path = str(abs_path)
+    def __init__(self, cap):
+        self.cap = cap
+        self._d = OrderedDict()
+
+    @staticmethod
+    def _digest(path):
+        return hashlib.blake2b(os.fsencode(path), digest_size=8).digest()
+
+    def __contains__(self, path):
+        return self._digest(path) in self._d
 
-    # Thread-safe duplicate prevention
-    with processed_files_lock:
-        if str_path in processed_files:
+    def __len__(self):
+        return len(self._d)
+
+    def _trim(self):
+        while len(self._d) > self.cap:
+            try:
+                self._d.popitem(last=False)
+            except KeyError:
+                break
+
+    def claim(self, path):
+        """Add path; True only for the one caller that actually inserted it."""
+        token = object()
+        if self._d.setdefault(self._digest(path), token) is not token:
             return False
-        processed_files.add(str_path)
+        self._trim()
+        return True
+
+    def add(self, path):
+        key = self._digest(path)
+        self._d[key] = None
+        try:
+            self._d.move_to_end(key)
+        except KeyError:
+            pass  # evicted concurrently
+        self._trim()
+
+    def discard(self, path):
+        self._d.pop(self._digest(path), None)
+
+TRACKED_PATHS_MAX = 100000  # per set; bounds memory of long-running watchdog sessions
+
+processed_files = BoundedSet(TRACKED_PATHS_MAX)
+logged_failures = BoundedSet(TRACKED_PATHS_MAX)
+logged_successes = BoundedSet(TRACKED_PATHS_MAX)
+
+# process_file result when another caller already claimed the path: truthy, so it is never retried
+ALREADY_HANDLED = "already-handled"
+
+def _is_fresh_file(path):
+    """True if path was written less than DELAY_AFTER_NEW_FILE seconds ago."""
+    try:
+        return time.time() - os.stat(path).st_mtime < DELAY_AFTER_NEW_FILE
+    except OSError:
+        return False
+
+def process_nfo_claimed(nfo_path, **kwargs):
+    """
+    process_nfo while holding nfo_path's processed_files claim, so the watchdog and the repair
+    pass never apply the same NFO at once. The claim is released afterwards: a re-downloaded
+    NFO must be applied again, and sequential repeats are cheap (hash match or already deleted).
+    """
+    if not processed_files.claim(nfo_path):
+        return ALREADY_HANDLED
+    try:
+        return process_nfo(nfo_path, **kwargs)
+    finally:
+        processed_files.discard(nfo_path)
+
+def process_file(str_path, schedule_timer=False, nfo_tasks_submitted=False):
+    """
+    Process str_path (absolute path string, already resolved by the scan / watchdog)
+    schedule_timer: if True (watchdog), schedules a delayed ratingKey repair for new files
+                    and leaves the Plex lookup (and NFO) of just-written files to that repair
+    nfo_tasks_submitted: True when the caller (run_processing) has already submitted its own
+                         process_nfo task for every NFO its scan found; the sibling NFO is then
+                         left entirely to that task and no NFO work is done here
+    """
+
+    # Thread-safe duplicate prevention: only the caller that inserted the path proceeds
+    if not processed_files.claim(str_path):
+        return ALREADY_HANDLED
 
     try:
         # ===== NFO Processing =====
         nfo_applied = True
         nfo_hash = None
-        if abs_path.suffix.lower() == ".nfo":
+        ext = file_ext(str_path)
+        base = str_path[:len(str_path) - len(ext)]
+        # Plex has almost certainly not scanned a file this new yet; any lookup now (including the
+        # one behind its NFO) would only force a library-wide index rebuild. The scheduled repair
+        # pass looks it up and applies the NFO instead.
+        defer_lookup = schedule_timer and ext in VIDEO_EXTS_SET and _is_fresh_file(str_path)
+        if ext == ".nfo":
             nfo_applied = process_nfo(str_path)
-        elif abs_path.suffix.lower() in VIDEO_EXTS:
-            nfo_path = abs_path.with_suffix(".nfo")
-            if nfo_path.exists():
-                nfo_applied = process_nfo(str(nfo_path))
+        elif defer_lookup:
+            logging.debug(f"[INFO] Deferring Plex lookup for new file: {str_path}")
+        elif ext in VIDEO_EXTS_SET:
+            if not nfo_tasks_submitted:
+                nfo_applied = process_nfo_claimed(base + ".nfo", missing_ok=True, video_path=str_path)
 
         # ===== Cache Check =====
         cached_entry = cache.get(str_path)
@@ -619,19 +1358,25 @@ def process_file(file_path, schedule_timer=False):
                 logging.info(f"[INFO] Skipping Plex call (NFO applied & cached): {str_path}")
                 logged_successes.add(str_path)
             logged_failures.discard(str_path)
+            if SUBTITLES_ENABLED:
+                process_subtitles(str_path, ratingKey=ratingKey)
             return True
         elif ratingKey and not nfo_hash:
             if str_path not in logged_successes:
                 logging.info(f"[INFO] Pending NFO apply (ratingKey exists, missing NFO hash): {str_path}")
                 logged_successes.add(str_path)
             logged_failures.discard(str_path)
+            if SUBTITLES_ENABLED:
+                process_subtitles(str_path, ratingKey=ratingKey)
             return True
         else:
-            plex_item = find_plex_item(str_path)
+            plex_item = None if defer_lookup else find_plex_item(str_path)
             if plex_item:
                 ratingKey = plex_item.ratingKey
                 update_cache(str_path, ratingKey=ratingKey)
                 logging.info(f"[INFO] Plex item found and cached: {str_path} (ratingKey={ratingKey})")
+                if SUBTITLES_ENABLED:
+                    process_subtitles(str_path, plex_item=plex_item)
             else:
                 update_cache(str_path, ratingKey=None)
                 logging.info(f"[INFO] File added to cache (no ratingKey found): {str_path}")
@@ -649,93 +1394,241 @@ def process_file(file_path, schedule_timer=False):
         if str_path not in logged_failures:
             logging.warning(f"[WARN] Error while processing {str_path}: {e}")
             logged_failures.add(str_path)
+        processed_files.discard(str_path)  # release the claim so a retry actually re-processes it
         return False
 
 # ==============================
 # Subtitle extraction & upload
 # ==============================
+# Image-based subtitle codecs (FFmpeg names plus common aliases) cannot be converted to SRT
+UNSUPPORTED_SUB_CODECS = frozenset({
+    "hdmv_pgs_subtitle", "dvd_subtitle", "dvb_subtitle", "xsub",
+    "pgs", "dvdsub", "hdmv_pgs", "vobsub",
+})
+
+def probe_subtitle_streams(video_path):
+    """
+    Yield subtitle stream dicts shaped like ffprobe's JSON ({"index", "codec_name", "tags": {"language"}}).
+    With PyAV the container is opened in-process (no fork/exec); otherwise ffprobe runs and its
+    output is parsed incrementally from the pipe when ijson is available.
+    """
+    if av is not None:
+        with av.open(video_path) as container:
+            for stream in container.streams.subtitles:
+                yield {
+                    "index": stream.index,
+                    "codec_name": stream.codec_context.name,
+                    "tags": {"language": stream.metadata.get("language", "und")},
+                }
+        return
+
+    cmd = [str(FFPROBE_BIN),"-v","error","-select_streams","s",
+           "-show_entries","stream=index,codec_name:stream_tags=language",
+           "-of","json",video_path]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        if ijson is not None:
+            yield from ijson.items(proc.stdout, "streams.item")
+        else:
+            yield from json_loads(proc.stdout.read()).get("streams", [])
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+def subtitle_streams(video_path):
+    """
+    [[index, codec, language], ...] for the video's subtitle streams.
+    Served from the cache while the video's mtime/size match the probed ones; otherwise ffprobe runs.
+    """
+    st = os.stat(video_path)
+    cached = cache.get(video_path)
+    if (cached and "subs" in cached
+            and cached.get("subs_mtime_ns") == st.st_mtime_ns and cached.get("subs_size") == st.st_size):
+        return cached["subs"]
+    streams = [
+        [s.get("index"), s.get("codec_name","").lower(), s.get("tags",{}).get("language","und")]
+        for s in probe_subtitle_streams(video_path)
+    ]
+    update_cache(video_path, subs=streams, video_stat=st)
+    return streams
+
 def extract_subtitles(video_path):
+    """Extract every supported subtitle stream with a single ffmpeg run (the container is demuxed once)."""
     base, _ = os.path.splitext(video_path)
     srt_files=[]
     try:
-        result=subprocess.run([str(FFPROBE_BIN),"-v","error","-select_streams","s",
-                               "-show_entries","stream=index:stream_tags=language,codec_name",
-                               "-of","json",video_path],
-                              capture_output=True,text=True,check=True)
-        streams=json.loads(result.stdout).get("streams",[])
-        for s in streams:
-            idx=s.get("index")
-            codec=s.get("codec_name","")
-            if codec.lower() in ["pgs","dvdsub","hdmv_pgs","vobsub"]:
+        supported = []
+        for idx, codec, language in subtitle_streams(video_path):
+            if codec in UNSUPPORTED_SUB_CODECS:
                 logging.warning(f"Skipping unsupported subtitle codec {codec} in {video_path}")
                 continue
-            lang=map_lang(s.get("tags",{}).get("language","und"))
+            supported.append((idx, codec, language))
+        if not supported:
+            return []  # nothing extractable: no directory listing, no ffmpeg
+
+        dir_name, base_name = os.path.split(base)
+        try:
+            with os.scandir(dir_name or ".") as it:
+                taken = {entry.name for entry in it}
+        except FileNotFoundError:
+            taken = set()
+
+        out_args=[]
+        for idx, codec, language in supported:
+            lang=map_lang(language)
+            srt_name=f"{base_name}.{lang}.srt"
+            if srt_name in taken: continue
+            taken.add(srt_name)
             srt=f"{base}.{lang}.srt"
-            if os.path.exists(srt): continue
-            subprocess.run([str(FFMPEG_BIN),"-y","-i",video_path,"-map",f"0:s:{idx}",srt],
-                           stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL,check=True)
+            # "index" is the absolute stream index; SubRip can be copied, other text formats are converted
+            out_args += ["-map",f"0:{idx}","-c:s","copy" if codec=="subrip" else "srt",srt]
             srt_files.append((srt,lang))
+
+        if out_args:
+            # text subtitles are tiny: one thread, no stdin, errors only
+            subprocess.run([str(FFMPEG_BIN),"-nostdin","-v","error","-threads","1","-y","-i",video_path] + out_args,
+                           stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL,check=True)
     except Exception as e:
         logging.error(f"[ERROR] Subtitle extraction failed: {video_path} - {e}")
+        return []
     return srt_files
 
+SUBTITLE_UPLOAD_RETRIES = 3
+SUBTITLE_BACKOFF_BASE = 0.2        # seconds; doubled per attempt, plus up to one base of jitter
+SUBTITLE_BACKOFF_MAX = 10.0
+_subtitle_upload_methods = {}      # item class -> (upload method name, accepts language=)
+
+def _accepts_language(method):
+    try:
+        params = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "language" or p.kind is p.VAR_KEYWORD for p in params)
+
+def _subtitle_upload_method(ep):
+    """
+    Resolve which upload method this plexapi item class provides, and whether it takes
+    a language argument, once per class. Returns (bound method, accepts_language).
+    """
+    cls = type(ep)
+    resolved = _subtitle_upload_methods.get(cls)
+    if resolved is None:
+        # plexapi may provide different method names; try common ones
+        name = "uploadSubtitles"
+        if not hasattr(ep, "uploadSubtitles") and hasattr(ep, "addSubtitles"):
+            name = "addSubtitles"
+        resolved = _subtitle_upload_methods[cls] = (name, _accepts_language(getattr(ep, name)))
+    name, accepts_language = resolved
+    return getattr(ep, name), accepts_language
+
 def upload_subtitles(ep,srt_files):
+    upload, accepts_language = _subtitle_upload_method(ep)
     for srt,lang in srt_files:
-        retries=3
-        while retries>0:
+        for attempt in range(SUBTITLE_UPLOAD_RETRIES):
             try:
-                with api_semaphore:
-                    # plexapi may provide different method names; try common ones
-                    if hasattr(ep, "uploadSubtitles"):
-                        ep.uploadSubtitles(srt,language=lang)
-                    elif hasattr(ep, "addSubtitles"):
-                        ep.addSubtitles(srt, language=lang)
-                    else:
-                        # fallback: try library-level upload (not ideal)
-                        try:
-                            ep.uploadSubtitles(srt, language=lang)
-                        except Exception:
-                            raise
-                    time.sleep(REQUEST_DELAY)
+                if accepts_language:
+                    upload(srt, language=lang)
+                else:
+                    upload(srt)  # plexapi's uploadSubtitles(filepath); language comes from the .lang.srt name
+                time.sleep(REQUEST_DELAY)
                 break
             except Exception as e:
-                retries-=1
-                logging.error(f"[ERROR] Subtitle upload failed: {srt} - {e}, retries left: {retries}")
+                retries_left = SUBTITLE_UPLOAD_RETRIES - attempt - 1
+                logging.error(f"[ERROR] Subtitle upload failed: {srt} - {e}, retries left: {retries_left}")
+                if retries_left:
+                    time.sleep(min(SUBTITLE_BACKOFF_MAX,
+                                   SUBTITLE_BACKOFF_BASE * 2 ** attempt + random.uniform(0, SUBTITLE_BACKOFF_BASE)))
+
+# Uploads are handed off to a pool sized to MAX_CONCURRENT_REQUESTS: the pool size itself is the
+# concurrency limit, so processing workers never sit blocked waiting for a request slot
+upload_pool = ThreadPoolExecutor(max_workers=max(1, MAX_CONCURRENT_REQUESTS), thread_name_prefix="plex-upload")
+
+def _upload_subtitles_task(str_path, srt_files, plex_item, ratingKey):
+    try:
+        ep = plex_item if plex_item is not None else plex.fetchItem(int(ratingKey))
+        upload_subtitles(ep, srt_files)
+    except Exception as e:
+        logging.error(f"[ERROR] Subtitle upload failed: {str_path} - {e}")
+
+def process_subtitles(str_path, plex_item=None, ratingKey=None):
+    """
+    Extract new subtitle tracks on the calling worker (the work itself runs in the ffmpeg child
+    process, and THREADS is CPU-sized), then queue their upload on upload_pool.
+    """
+    try:
+        srt_files = extract_subtitles(str_path)
+        if not srt_files:
+            return
+        upload_pool.submit(_upload_subtitles_task, str_path, srt_files, plex_item, ratingKey)
+    except Exception as e:
+        logging.error(f"[ERROR] Subtitle processing failed: {str_path} - {e}")
 
 # ==============================
 # Global Timers / Locks
 # ==============================
 CACHE_REPAIR_INTERVAL = 300        # Default interval (5 minutes)
 DELAY_AFTER_NEW_FILE = 60          # 1 minute after new file detection
-repair_timer = None
-repair_lock = threading.Lock()
+# One long-lived scheduler thread; rescheduling just moves its deadline (no Timer thread per run)
+_repair_cv = threading.Condition()
+_repair_due = None                 # time.monotonic() of the next repair, None = not scheduled
+_repair_thread = None
+_repair_stopped = False
 
 
 def schedule_cache_repair(delay):
-    """Schedule cache repair after the specified delay; cancel existing timer if present."""
-    global repair_timer
-    with repair_lock:
-        if repair_timer:
-            logging.debug(f"[CACHE] Existing repair timer canceled")
-            repair_timer.cancel()
-        repair_timer = threading.Timer(delay, repair_wrapper)
-        repair_timer.daemon = True
-        repair_timer.start()
-        logging.debug(f"[CACHE] Repair timer scheduled to run in {delay} seconds ({time.strftime('%H:%M:%S')})")
-
-
-def repair_wrapper():
-    """Execute the actual repair, then reschedule with the default interval."""
-    global repair_timer
-    logging.debug(f"[CACHE] Repair wrapper triggered at {time.strftime('%H:%M:%S')}")
-    try:
-        repair_missing_ratingkeys()
-    except Exception as e:
-        logging.error(f"[CACHE] repair_missing_ratingkeys failed: {e}", exc_info=True)
+    """
+    Schedule cache repair after the specified delay. An earlier pending run is kept, so a steady
+    stream of new files cannot keep pushing the repair back.
+    """
+    global _repair_due, _repair_thread
+    due = time.monotonic() + delay
+    with _repair_cv:
+        if _repair_due is not None and _repair_due <= due:
+            return
+        _repair_due = due
+        if _repair_thread is None:
+            _repair_thread = threading.Thread(target=_repair_loop, name="cache-repair", daemon=True)
+            _repair_thread.start()
+        _repair_cv.notify()
+    logging.debug(f"[CACHE] Repair scheduled to run in {delay} seconds ({time.strftime('%H:%M:%S')})")
+
+
+def stop_cache_repair():
+    global _repair_stopped
+    with _repair_cv:
+        _repair_stopped = True
+        _repair_cv.notify()
+
+
+def _repair_loop():
+    """Wait for the scheduled deadline, repair, then reschedule with the default interval."""
+    global _repair_due
+    while True:
+        with _repair_cv:
+            while True:
+                if _repair_stopped:
+                    return
+                if _repair_due is None:
+                    _repair_cv.wait()
+                    continue
+                remaining = _repair_due - time.monotonic()
+                if remaining <= 0:
+                    break
+                _repair_cv.wait(remaining)
+            _repair_due = None
 
-    # Reschedule for the default interval
-    logging.debug(f"[CACHE] Rescheduling next repair in {CACHE_REPAIR_INTERVAL} seconds")
-    schedule_cache_repair(CACHE_REPAIR_INTERVAL)
+        logging.debug(f"[CACHE] Repair triggered at {time.strftime('%H:%M:%S')}")
+        try:
+            repair_missing_ratingkeys()
+        except Exception as e:
+            logging.error(f"[CACHE] repair_missing_ratingkeys failed: {e}", exc_info=True)
+
+        with _repair_cv:
+            if _repair_due is None:  # not rescheduled by a new file while repairing
+                logging.debug(f"[CACHE] Rescheduling next repair in {CACHE_REPAIR_INTERVAL} seconds")
+                _repair_due = time.monotonic() + CACHE_REPAIR_INTERVAL
 
 # ==============================
 # Watchdog Handler (integrated VIDEO_EXTS + NFO handling, intelligent retry)
@@ -743,81 +1636,200 @@ def repair_wrapper():
 class MediaFileHandler(FileSystemEventHandler):
     MAX_NFO_RETRY = 5  # NFO retry limit
     MAX_RETRY_DELAY = 600  # 10 minutes
+    MAX_RETRY_QUEUE = TRACKED_PATHS_MAX  # pending paths; new paths beyond this are dropped
 
     def __init__(self, nfo_wait=30, video_wait=5, debounce_delay=1.0):
         self.nfo_wait = nfo_wait
         self.video_wait = video_wait
         self.debounce_delay = debounce_delay
-        # retry_queue = { path: (next_time, delay, retry_count, is_nfo) }
+        # retry_queue = { path: (next_time, delay, retry_count, is_nfo) } — latest entry per path
         self.retry_queue = {}
-        self.last_event_time = {}
+        # min-heap of (next_time, path); a path whose deadline moved later keeps its old heap entry,
+        # which is re-pushed with the current deadline when it comes up (see _pop_due)
+        self._retry_heap = []
+        self._retry_cv = threading.Condition()
+        self._first_event = {}  # path -> time of the first event of its current burst
+        self._forced = set()    # paths whose pending deadline was capped by MAX_WAIT_FACTOR
 
     # ==============================
     # Utility
     # ==============================
-    def _debounce(self, path):
+    @staticmethod
+    def _res(path):
+        """
+        Normalized absolute path str (pure string work, no syscalls). Symlinks are deliberately
+        not resolved: the scan and Plex both key files by their path under the library folder.
+        """
+        return os.path.abspath(path)
+
+    MAX_WAIT_FACTOR = 5  # a burst is flushed at most this many debounce waits after its first event
+
+    def _schedule_event(self, path, wait, is_nfo):
+        """
+        Coalesce filesystem events: each new event for a path replaces its pending entry,
+        so a burst (e.g. a downloader writing in chunks) is processed once, after it settles.
+        A path that never settles is still processed MAX_WAIT_FACTOR waits after its first event,
+        and is then re-armed so it runs again once the burst ends (see process_retry_queue).
+        """
+        wait = max(wait, self.debounce_delay)
         now = time.time()
-        last_time = self.last_event_time.get(path, 0)
-        if now - last_time < self.debounce_delay:
+        # The file changed (written, re-created or moved in): release its processed claim
+        # so it is processed again once it settles
+        processed_files.discard(path)
+        with self._retry_cv:
+            first = self._first_event.setdefault(path, now)
+            next_time = now + wait
+            cap = first + wait * self.MAX_WAIT_FACTOR
+            if cap < next_time:
+                next_time = cap
+                self._forced.add(path)
+            if not self._set_pending(path, next_time, wait, 0, is_nfo):
+                self._first_event.pop(path, None)
+                self._forced.discard(path)
+                logging.warning(f"[WATCHDOG] Retry queue full ({self.MAX_RETRY_QUEUE}), dropping: {path}")
+                return
+        logging.debug(f"[WATCHDOG] Scheduled ({'NFO' if is_nfo else 'VIDEO'}): {path} in {next_time - now:.1f}s")
+
+    def _set_pending(self, path, next_time, delay, retry_count, is_nfo):
+        """
+        Record path's pending entry (caller holds _retry_cv). Returns False if the queue is full.
+        Repeat events for a pending path only update the dict: the heap is touched (and the
+        observer loop woken) only when the deadline moves earlier, so a burst costs O(1) per event.
+        """
+        pending = self.retry_queue.get(path)
+        if pending is None and len(self.retry_queue) >= self.MAX_RETRY_QUEUE:
             return False
-        self.last_event_time[path] = now
+        self.retry_queue[path] = (next_time, delay, retry_count, is_nfo)
+        if pending is None or next_time < pending[0]:
+            heapq.heappush(self._retry_heap, (next_time, path))
+            self._retry_cv.notify()
         return True
 
     def _enqueue_retry(self, path, delay, retry_count=0, is_nfo=False):
-        """Add to retry queue"""
-        self.retry_queue[path] = (time.time() + delay, delay, retry_count, is_nfo)
+        """Add to retry queue and wake the observer loop if this is now the earliest entry"""
+        next_time = time.time() + delay
+        with self._retry_cv:
+            if not self._set_pending(path, next_time, delay, retry_count, is_nfo):
+                logging.warning(f"[WATCHDOG] Retry queue full ({self.MAX_RETRY_QUEUE}), dropping: {path}")
+                return
         logging.debug(f"[WATCHDOG] Enqueued for retry ({'NFO' if is_nfo else 'VIDEO'}): {path} (delay={delay}s, retry={retry_count})")
 
     # ==============================
-    # Retry queue processing
+    # Folder walks (background thread)
     # ==============================
-    def process_retry_queue(self):
-        global cache_modified
+    WALK_BATCH = 256  # entries pushed per lock acquisition
+
+    def _start_dir_walk(self, dir_path):
+        """Walk dir_path off the event/retry threads so they keep servicing other paths."""
+        threading.Thread(target=self._walk_dir, args=(dir_path,), name="dir-walk", daemon=True).start()
+
+    def _walk_dir(self, dir_path):
+        batch = []
+        for f, ext in iter_media_files(dir_path):
+            batch.append((f, ext == ".nfo"))
+            if len(batch) >= self.WALK_BATCH:
+                self._enqueue_walked(batch)
+                batch = []
+        if batch:
+            self._enqueue_walked(batch)
+
+    def _enqueue_walked(self, batch):
+        """Enqueue [(path, is_nfo)] under a single lock acquisition (same coalescing as _schedule_event)."""
+        now = time.time()
+        has_video = False
+        dropped = 0
+        with self._retry_cv:
+            for path, is_nfo in batch:
+                processed_files.discard(path)  # moved-in files are processed again (see _schedule_event)
+                delay = max(self.nfo_wait if is_nfo else self.video_wait, self.debounce_delay)
+                if not self._set_pending(path, now + delay, delay, 0, is_nfo):
+                    dropped += 1
+                    continue
+                has_video = has_video or not is_nfo
+        if has_video:
+            invalidate_plex_path_index()
+        if dropped:
+            logging.warning(f"[WATCHDOG] Retry queue full ({self.MAX_RETRY_QUEUE}), dropped {dropped} files from folder walk")
+        logging.debug(f"[WATCHDOG] Enqueued {len(batch) - dropped} files from folder walk")
+
+    def wait_for_due(self, max_wait=None):
+        """Block until the earliest retry is due or a new one is enqueued (or max_wait seconds pass)."""
+        with self._retry_cv:
+            if not self._retry_heap:
+                self._retry_cv.wait(max_wait)
+            else:
+                timeout = self._retry_heap[0][0] - time.time()
+                if max_wait is not None:
+                    timeout = min(timeout, max_wait)
+                if timeout > 0:
+                    self._retry_cv.wait(timeout)
+
+    def _pop_due(self):
+        """Remove and return [(path, entry, forced)] for every retry whose time has come."""
         now = time.time()
-        ready = [p for p, (t, _, _, _) in self.retry_queue.items() if t <= now]
+        due = []
+        with self._retry_cv:
+            heap = self._retry_heap
+            while heap and heap[0][0] <= now:
+                next_time, path = heapq.heappop(heap)
+                entry = self.retry_queue.get(path)
+                if entry is None:
+                    continue  # already processed via another heap entry
+                if entry[0] > now:
+                    heapq.heappush(heap, (entry[0], path))  # deadline was pushed back by later events
+                    continue
+                del self.retry_queue[path]
+                self._first_event.pop(path, None)
+                forced = path in self._forced
+                self._forced.discard(path)
+                due.append((path, entry, forced))
+        return due
 
-        for path in ready:
-            next_time, delay, retry_count, is_nfo = self.retry_queue.pop(path)
+    # ==============================
+    # Retry queue processing
+    # ==============================
+    def process_retry_queue(self):
+        for path, (next_time, delay, retry_count, is_nfo), forced in self._pop_due():
             p = Path(path)
 
             if not p.exists():
-                ext = Path(path).suffix.lower()
-                if ext in VIDEO_EXTS:
+                ext = file_ext(path)
+                if ext in VIDEO_EXTS_SET:
                     logging.info(f"[WATCHDOG] Video file removed, deleting from cache: {path}")
-                    with cache_lock:
-                        if path in cache:
-                            cache.pop(path)
-                            cache_modified = True
+                    remove_from_cache(path)
                 else:
                     logging.debug(f"[WATCHDOG] NFO or non-video file removed: {path} (cache retained)")
                 continue
 
-            ext = p.suffix.lower()
+            ext = file_ext(path)
 
             # Folder handling
             if p.is_dir():
-                for f in p.rglob("*"):
-                    if not f.is_file():
-                        continue
-                    fext = f.suffix.lower()
-                    if fext in VIDEO_EXTS:
-                        self._enqueue_retry(str(f.resolve()), self.video_wait)
-                    elif fext == ".nfo":
-                        self._enqueue_retry(str(f.resolve()), self.nfo_wait, is_nfo=True)
+                self._start_dir_walk(path)
                 continue
 
             # Single file handling
             success = False
-            if ext in VIDEO_EXTS:
+            if ext in VIDEO_EXTS_SET:
                 logging.info(f"[WATCHDOG] Processing video: {path}")
-                success = process_file(str(p.resolve()))
+                success = process_file(path, schedule_timer=True)
             elif ext == ".nfo":
                 logging.info(f"[WATCHDOG] Processing NFO: {path}")
-                success = process_nfo(str(p.resolve()))
+                success = process_nfo_claimed(path, defer_fresh=True)
             else:
                 logging.debug(f"[WATCHDOG] Ignored non-video/non-NFO file: {p}")
                 continue
 
+            if forced:
+                # Flushed by the MAX_WAIT_FACTOR cap, possibly mid-write: run again once the burst
+                # ends (_schedule_event releases the claim), so the finished file is processed too
+                self._schedule_event(path, delay, is_nfo)
+                continue
+
+            if success is ALREADY_HANDLED:
+                logging.debug(f"[WATCHDOG] Already processed, nothing to do: {path}")
+                continue
+
             # Retry on failure
             if not success:
                 if is_nfo and retry_count + 1 >= self.MAX_NFO_RETRY:
@@ -827,86 +1839,108 @@ class MediaFileHandler(FileSystemEventHandler):
                 self._enqueue_retry(path, new_delay, retry_count + 1, is_nfo)
                 logging.warning(f"[WATCHDOG] Retry scheduled for {path} in {new_delay}s (retry #{retry_count + 1})")
 
-        if cache_modified:
-            logging.info(f"[CACHE] Saving cache, {len(cache)} entries")
-            save_cache()
-            cache_modified = False
+        # Cache changes are written by the background flusher (at most once per CACHE_FLUSH_INTERVAL)
 
     # ==============================
     # Event Handlers
     # ==============================
-    def on_created(self, event):
-        if not self._debounce(event.src_path):
-            return
-        path = str(Path(event.src_path).resolve())
-        ext = Path(path).suffix.lower()
+    @staticmethod
+    def _is_media(raw_path):
+        """Extension check on the raw event path, before any path normalization."""
+        ext = file_ext(raw_path)
+        return ext in VIDEO_EXTS_SET or ext == ".nfo"
 
+    def on_created(self, event):
         # 🎬 Video files and 📄 NFO files only
-        if ext in VIDEO_EXTS:
-            self._enqueue_retry(path, self.video_wait, is_nfo=False)
-        elif ext == ".nfo":
-            self._enqueue_retry(path, self.nfo_wait, is_nfo=True)
+        if not self._is_media(event.src_path):
+            logging.debug(f"[WATCHDOG] Ignored file: {event.src_path}")
+            return
+        path = self._res(event.src_path)
+        if file_ext(path) in VIDEO_EXTS_SET:
+            invalidate_plex_path_index()
+            self._schedule_event(path, self.video_wait, is_nfo=False)
         else:
-            logging.debug(f"[WATCHDOG] Ignored file: {path}")
+            self._schedule_event(path, self.nfo_wait, is_nfo=True)
+
+    def on_modified(self, event):
+        # Writes after creation only push the pending entry's deadline back
+        if not event.is_directory and self._is_media(event.src_path):
+            self.on_created(event)
 
     def on_deleted(self, event):
-        self._handle_deleted(str(Path(event.src_path).resolve()))
+        if not event.is_directory and not self._is_media(event.src_path):
+            return
+        self._handle_deleted(self._res(event.src_path))
 
     def on_moved(self, event):
-        src = str(Path(event.src_path).resolve())
-        dest = str(Path(event.dest_path).resolve()) if getattr(event, "dest_path", None) else None
-        self._handle_deleted(src)
-        if dest and not event.is_directory:
-            self._handle_created(dest)
+        if event.is_directory or self._is_media(event.src_path):
+            self._handle_deleted(self._res(event.src_path))
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path and not event.is_directory and self._is_media(dest_path):
+            self._handle_created(self._res(dest_path))
 
     # ==============================
     # Cache removal (on delete or folder move)
     # ==============================
     def _handle_deleted(self, abs_path):
-        abs_path = str(Path(abs_path).resolve())
-        if not self._debounce(abs_path):
-            return
-        keys_to_remove = [k for k in cache.keys() if k == abs_path or k.startswith(f"{abs_path}/")]
+        with cache_lock:
+            keys_to_remove = cached_paths_under(abs_path)
         if not keys_to_remove:
             return  # 🔹 No changes — return immediately
         for k in keys_to_remove:
             remove_from_cache(k)
             logging.info(f"[CACHE] Removed {k} (deleted/moved)")
-        global cache_modified
-        cache_modified = True
 
     # ==============================
     # Handle create/move events
     # ==============================
     def _handle_created(self, abs_path):
-        """Register only video/NFO files including inside folders"""
-        abs_path = str(Path(abs_path).resolve())
-        if not self._debounce(abs_path):
+        """Register only video/NFO files including inside folders (abs_path is already resolved)"""
+        if os.path.isdir(abs_path):
+            self._start_dir_walk(abs_path)
             return
 
-        p = Path(abs_path)
-        paths = []
-        if p.is_dir():
-            paths = [str(f.resolve()) for f in p.rglob("*") if f.is_file()]
+        ext = file_ext(abs_path)
+        if ext in VIDEO_EXTS_SET:
+            invalidate_plex_path_index()
+            self._schedule_event(abs_path, self.video_wait, is_nfo=False)
+        elif ext == ".nfo":
+            self._schedule_event(abs_path, self.nfo_wait, is_nfo=True)
         else:
-            paths = [abs_path]
-
-        for f in paths:
-            ext = Path(f).suffix.lower()
-            if ext in VIDEO_EXTS:
-                self._enqueue_retry(f, self.video_wait, is_nfo=False)
-            elif ext == ".nfo":
-                self._enqueue_retry(f, self.nfo_wait, is_nfo=True)
-            else:
-                logging.debug(f"[WATCHDOG] Ignored file in folder: {f}")
+            logging.debug(f"[WATCHDOG] Ignored file: {abs_path}")
 
 # ==============================
 # Watchdog Observer Loop
 # ==============================
-def start_watchdog(base_dirs):
-    observer = Observer()
-    handler = MediaFileHandler(debounce_delay=WATCH_DEBOUNCE_DELAY)
+NETWORK_FS_TYPES = frozenset({"nfs", "nfs4", "cifs", "smbfs", "smb3", "fuse.sshfs", "9p"})
+DEFAULT_POLL_INTERVAL = 2.0
 
+def is_network_fs(path):
+    """True if path lives on a network filesystem (per /proc/mounts), where inotify misses remote changes."""
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    path = os.path.realpath(path)
+    best, fs_type = "", ""
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, fs_type = mount_point, mount_type
+    return fs_type in NETWORK_FS_TYPES
+
+def create_observer(base_dirs):
+    """Native observer by default; PollingObserver when configured or when a watched folder is a network share."""
+    interval = WATCH_POLL_INTERVAL
+    if not interval and any(is_network_fs(d) for d in base_dirs if os.path.isdir(d)):
+        interval = DEFAULT_POLL_INTERVAL
+        logging.info(f"[WATCHDOG] Network filesystem detected, polling every {interval}s")
+    if interval:
+        return PollingObserver(timeout=interval)
+    return Observer()
+
+def _schedule_dirs(observer, handler, base_dirs):
     for d in base_dirs:
         if os.path.exists(d) and os.path.isdir(d):
             observer.schedule(handler, d, recursive=True)
@@ -914,10 +1948,41 @@ def start_watchdog(base_dirs):
         else:
             logging.warning(f"[WATCHDOG] Directory not found, skipping: {d}")
 
+def _watch_new_library_paths(observer, handler, watched):
+    """
+    Schedule library folders not watched yet: sections that failed to load at startup
+    (e.g. Plex unreachable) and were picked up later by get_plex_sections' retry.
+    """
+    new_dirs = [d for d in get_library_paths() if d not in watched]
+    if not new_dirs:
+        return
+    watched.update(new_dirs)
+    try:
+        _schedule_dirs(observer, handler, new_dirs)
+    except OSError as e:
+        logging.error(f"[WATCHDOG] Failed to watch new library folders {new_dirs}: {e}")
+
+def start_watchdog(base_dirs):
+    watched = set(base_dirs)
+    sections = get_plex_sections()
+    observer = create_observer(base_dirs)
+    handler = MediaFileHandler(debounce_delay=WATCH_DEBOUNCE_DELAY)
+    _schedule_dirs(observer, handler, base_dirs)
+
     try:
         observer.start()
     except RuntimeError:
         logging.error("[WATCHDOG] No valid directories to watch. Observer failed to start.")
+    except OSError as e:
+        # inotify needs one watch per directory; large libraries can exceed fs.inotify.max_user_watches
+        if e.errno not in (errno.ENOSPC, errno.EMFILE) or isinstance(observer, PollingObserver):
+            raise
+        logging.warning(f"[WATCHDOG] inotify limit reached ({e}); falling back to polling every {DEFAULT_POLL_INTERVAL}s. "
+                        "Raise fs.inotify.max_user_watches to use native events.")
+        observer.stop()
+        observer = PollingObserver(timeout=DEFAULT_POLL_INTERVAL)
+        _schedule_dirs(observer, handler, base_dirs)
+        observer.start()
 
     logging.info("[WATCHDOG] Started observer loop")
 
@@ -926,17 +1991,19 @@ def start_watchdog(base_dirs):
 
     try:
         while True:
+            # While some sections failed to load, wake at least once per retry interval to pick them up
+            handler.wait_for_due(PLEX_SECTIONS_RETRY_INTERVAL if _plex_sections_retry_at is not None else None)
+            if get_plex_sections() is not sections:  # re-fetched: a retry (here or in an index build) ran
+                sections = get_plex_sections()
+                _watch_new_library_paths(observer, handler, watched)
             try:
                 handler.process_retry_queue()
             except Exception as e:
                 logging.error(f"[WATCHDOG] process_retry_queue failed: {e}", exc_info=True)
-            time.sleep(1)
     except KeyboardInterrupt:
         logging.info("[WATCHDOG] Stopping observer")
         observer.stop()
-        with repair_lock:
-            if repair_timer:
-                repair_timer.cancel()
+        stop_cache_repair()
         observer.join()
 
 # ==============================
@@ -944,109 +2011,152 @@ def start_watchdog(base_dirs):
 # ==============================
 def repair_missing_ratingkeys():
     """Scan cache and restore missing ratingKeys from Plex."""
-    missing = [
-        path for path, data in cache.items()
-        if data is not None and not data.get("ratingKey") and Path(path).exists()
-    ]
+    with cache_lock:
+        candidates = [path for path, data in cache.items() if data is not None and not data.get("ratingKey")]
+    missing = [path for path in candidates if os.path.exists(path)]
 
     if not missing:
         logging.debug("[CACHE] No missing ratingKeys found.")
         return
 
     logging.info(f"[CACHE] Found {len(missing)} entries missing ratingKeys — attempting repair...")
+    invalidate_plex_path_index()  # Plex may have scanned new files since the last build
+    ensure_plex_path_index(force=True)  # one library walk; every lookup below is a dict hit
 
-    repaired = 0
+    repaired = {}
+    items = {}
     for path in missing:
-        try:
-            plex_item = find_plex_item(path)
-            if plex_item:
-                update_cache(path, ratingKey=plex_item.ratingKey)
-                logging.info(f"[CACHE] Restored ratingKey for {path} → {plex_item.ratingKey}")
-                repaired += 1
-        except Exception as e:
-            logging.warning(f"[CACHE] Failed to repair {path}: {e}")
-
-    if repaired > 0:
-        save_cache()
-        logging.info(f"[CACHE] RatingKey repair completed — {repaired} entries updated.")
+        plex_item = find_plex_item(path)
+        if plex_item:
+            repaired[path] = plex_item.ratingKey
+            items[path] = plex_item
+            logging.info(f"[CACHE] Restored ratingKey for {path} → {plex_item.ratingKey}")
+
+    stored = set_cached_ratingkeys(repaired) if repaired else []
+    if stored:
+        logging.info(f"[CACHE] RatingKey repair completed — {len(stored)} entries updated.")
+        # New watchdog files get their first Plex match here (see process_file)
+        for path in stored:
+            plex_item = items[path]
+            nfo_path = path[:len(path) - len(file_ext(path))] + ".nfo"
+            process_nfo_claimed(nfo_path, plex_item=plex_item, missing_ok=True, video_path=path)
+            if SUBTITLES_ENABLED:
+                process_subtitles(path, plex_item=plex_item)
     else:
         logging.info("[CACHE] No ratingKeys could be repaired.")
 
 # ==============================
-# Scan: NFO only (new)
+# Directory scan (os.scandir, one pass)
 # ==============================
-def scan_nfo_files(base_dirs):
+def iter_media_files(base_dirs):
     """
-    base_dirs: can be a single Path or list[Path]
+    Yield (abs_path, ext) for every video/NFO file under base_dirs.
+    Uses os.scandir so directory/file type comes from the dirent (no extra stat),
+    and classifies by extension without building Path objects.
     """
     if isinstance(base_dirs, (str, Path)):
         base_dirs = [base_dirs]
 
-    nfo_files = []
-    for base_dir in base_dirs:
-        for root, _, files in os.walk(base_dir):
-            for f in files:
-                if f.lower().endswith(".nfo"):
-                    nfo_files.append(os.path.abspath(os.path.join(root, f)))
+    stack = [os.path.abspath(d) for d in base_dirs]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError as e:
+            logging.debug(f"[SCAN] Cannot read directory {d}: {e}")
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+                ext = file_ext(entry.name)
+                if ext in VIDEO_EXTS_SET or ext == ".nfo":
+                    yield entry.path, ext
+
+# ==============================
+# Scan: NFO only (new)
+# ==============================
+def scan_nfo_files(base_dirs):
+    """
+    base_dirs: can be a single Path or list[Path]
+    """
+    nfo_files = [path for path, ext in iter_media_files(base_dirs) if ext == ".nfo"]
 
     if DETAIL:
         logging.debug(f"[SCAN] Found {len(nfo_files)} NFO files")
     return nfo_files
 
+def scan_media_files(base_dirs):
+    """One directory walk for both lists: returns (set of video paths, list of NFO paths)."""
+    video_files = set()
+    nfo_files = []
+    for path, ext in iter_media_files(base_dirs):
+        if ext == ".nfo":
+            nfo_files.append(path)
+        else:
+            video_files.add(path)
+    if DETAIL:
+        logging.debug(f"[SCAN] Found {len(video_files)} video / {len(nfo_files)} NFO files")
+    return video_files, nfo_files
+
 # ==============================
 # Scan and update cache (thread-safe, integrated)
 # ==============================
-def scan_and_update_cache(base_dirs):
+def scan_and_update_cache(base_dirs, current_files=None):
     """
     Cache update:
-    1) Scan directories → current_files
+    1) Scan directories → current_files (or use the video set from an earlier scan_media_files)
     2) Compare with cache:
        - Files not in cache → add (fetch from Plex)
        - Files in cache but missing from disk → remove
-    3) Save cache if any changes occurred
+    3) Mark the cache dirty if anything changed (written by the flusher / final save)
     """
-    global cache, cache_modified
-
-    if isinstance(base_dirs, (str, Path)):
-        base_dirs = [base_dirs]
 
-    current_files = set()
-    for base_dir in base_dirs:
-        for root, _, files in os.walk(base_dir):
-            for f in files:
-                abs_path = os.path.abspath(os.path.join(root, f))
-                if abs_path.lower().endswith(VIDEO_EXTS):
-                    current_files.add(abs_path)
+    if current_files is None:
+        current_files = {path for path, ext in iter_media_files(base_dirs) if ext != ".nfo"}
 
     logging.info(f"[CACHE] Scanned {len(current_files)} video files in directories.")
 
+    # ---- Diff (brief lock) ----
+    with cache_lock:
+        cache_paths = set(cache)
+    to_add = current_files - cache_paths
+    to_remove = cache_paths - current_files
+
+    # ---- Plex lookups for new files (no lock held; one index build, then dict hits) ----
+    if to_add:
+        ensure_plex_path_index()
+    new_entries = {}
+    for path in to_add:
+        plex_item = find_plex_item(path)
+        if plex_item:
+            new_entries[path] = {"ratingKey": plex_item.ratingKey}
+            logging.info(f"[CACHE] Added: {path} (ratingKey={plex_item.ratingKey})")
+        else:
+            new_entries[path] = {}  # placeholder
+            logging.info(f"[CACHE] Added (no Plex match): {path}")
+
+    # ---- Apply (single lock acquisition) ----
     added_count = 0
     removed_count = 0
-
     with cache_lock:
-        # ---- Add new files ----
-        for path in current_files:
-            if path not in cache:
-                plex_item = find_plex_item(path)
-                if plex_item:
-                    cache[path] = {"ratingKey": plex_item.ratingKey}
-                    logging.info(f"[CACHE] Added: {path} (ratingKey={plex_item.ratingKey})")
-                else:
-                    cache[path] = {}  # placeholder
-                    logging.info(f"[CACHE] Added (no Plex match): {path}")
+        for path, entry in new_entries.items():
+            if path not in cache:  # a worker may have cached it meanwhile; keep its entry
+                cache[path] = entry
+                _mark_cache_dirty(path)  # written by the flusher / final save, not mid-run
                 added_count += 1
-                cache_modified = True
-
-        # ---- Remove missing files ----
-        for path in list(cache.keys()):
-            if path not in current_files:
-                cache.pop(path, None)
+        for path in to_remove:
+            if path in cache:  # may already be gone via a watchdog delete
+                del cache[path]
                 logging.info(f"[CACHE] Removed: {path} (file missing)")
+                _mark_cache_dirty(path)
                 removed_count += 1
-                cache_modified = True
 
-    if cache_modified:
-        save_cache()
+    if added_count or removed_count:
         logging.info(f"[CACHE] Update complete: +{added_count}, -{removed_count}, total={len(cache)}")
     else:
         logging.info("[CACHE] No changes detected.")
@@ -1057,32 +2167,39 @@ def run_processing(base_dirs):
     2) Process video + NFO files (ThreadPoolExecutor)
     3) Save final cache
     """
-    # 1) Cache scan/update
-    scan_and_update_cache(base_dirs)
+    # 1) Cache scan/update (Plex path index built up front, not lazily inside the cache lock)
+    # A single directory walk feeds both the cache update and the NFO list
+    current_videos, nfo_files = scan_media_files(base_dirs)
+    ensure_plex_path_index()
+    scan_and_update_cache(base_dirs, current_files=current_videos)
 
     # 2) Video / NFO lists
-    video_files = [f for f in cache.keys() if Path(f).suffix.lower() in VIDEO_EXTS]
-    nfo_files = scan_nfo_files(base_dirs)
+    video_files = [f for f in cache.keys() if file_ext(f) in VIDEO_EXTS_SET]
 
     logging.info(f"[MAIN] {len(video_files)} video files to process.")
     logging.info(f"[MAIN] {len(nfo_files)} NFO files to process.")
 
     # 3) Process with ThreadPoolExecutor
     with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        # NFO pass 1: hash + cache lookup
+        nfo_plans = list(executor.map(plan_nfo, nfo_files))
+        # NFO pass 2: batched Plex fetch for NFOs that need applying
+        prefetched = fetch_plex_items(rk for _, _, rk in nfo_plans if rk)
         # NFO processing
-        for nfo in nfo_files:
-            executor.submit(process_nfo, nfo)
+        for nfo, nfo_hash, rk in nfo_plans:
+            executor.submit(process_nfo, nfo, nfo_hash=nfo_hash, plex_item=prefetched.get(str(rk)) if rk else None)
         # Video processing
-        futures = {executor.submit(process_file, f): f for f in video_files}
+        # every scanned NFO has a task above; process_file must not fetch/edit the same item again
+        futures = {executor.submit(process_file, f, nfo_tasks_submitted=True): f for f in video_files}
         for fut in as_completed(futures):
             try:
                 fut.result()
             except Exception as e:
                 logging.error(f"[MAIN] Failed: {futures[fut]} - {e}")
 
-    # 4) Final cache save
-    logging.debug("[CACHE] Final save_cache() called")
-    save_cache()
+    # 4) Final cache save: fold the change log into a full snapshot
+    logging.debug("[CACHE] Final compact_cache() called")
+    compact_cache()
     logging.info(f"[CACHE] Final cache saved successfully, {len(cache)} entries")
         
 # ==============================
@@ -1093,18 +2210,7 @@ def process_all_nfo(base_dirs):
     base_dirs: can be a single Path or list[Path]
     Process all NFO files within base_dirs
     """
-    if isinstance(base_dirs, (str, Path)):
-        base_dirs = [base_dirs]
-
-    nfo_files = []
-    for base_dir in base_dirs:
-        for root, dirs, files in os.walk(base_dir):
-            for f in files:
-                if f.lower().endswith(".nfo"):
-                    nfo_files.append(os.path.abspath(os.path.join(root, f)))
-
-    if DETAIL:
-        logging.debug(f"[SCAN] Found {len(nfo_files)} NFO files")
+    nfo_files = scan_nfo_files(base_dirs)
 
     for nfo_file in nfo_files:
         try:
@@ -1116,15 +2222,11 @@ def process_all_nfo(base_dirs):
 # Main Execution
 # ==============================
 def main():
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    start_cache_flusher()
     setup_ffmpeg()
 
-    base_dirs = []
-    for lib_id in config.get("PLEX_LIBRARY_IDS", []):
-        try:
-            section = plex.library.sectionByID(lib_id)
-        except Exception:
-            continue
-        base_dirs.extend(getattr(section, "locations", []))
+    base_dirs = list(get_library_paths())
 
     if DISABLE_WATCHDOG:
         logging.info("[MAIN] Running initial full processing (watchdog disabled)")
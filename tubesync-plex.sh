@@ -33,6 +33,7 @@ DISABLE_WATCHDOG=false
 DEBUG=false
 DEBUG_HTTP=false
 CONFIG_PATH=""
+POLL_INTERVAL=""
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -41,6 +42,7 @@ while [[ $# -gt 0 ]]; do
         --debug) DEBUG=true; shift ;;
         --debug-http) DEBUG_HTTP=true; shift ;;
         --config) CONFIG_PATH="$2"; shift 2 ;;
+        --poll-interval) POLL_INTERVAL="$2"; shift 2 ;;
         *) echo "Unknown option: $1"; exit 1 ;;
     esac
 done
@@ -121,6 +123,7 @@ if [ -f "$PY_FILE" ]; then
     [ "$DISABLE_WATCHDOG" = true ] && CMD="$CMD --disable-watchdog"
     [ "$DEBUG" = true ] && CMD="$CMD --debug"
     [ "$DEBUG_HTTP" = true ] && CMD="$CMD --debug-http"
+    [ -n "$POLL_INTERVAL" ] && CMD="$CMD --poll-interval $POLL_INTERVAL"
     exec $CMD
 else
     log "ERROR: tubesync-plex-metadata.py not found."